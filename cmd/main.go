@@ -14,14 +14,31 @@ import (
 func main() {
 	// Parse command line arguments
 	mode := flag.String("mode", "live", "Trading mode: live or backtest")
+	record := flag.String("record", "", "Record live data: ticks (CSV) or raw (frames only, no analysis)")
+	config := flag.String("config", "", "JSON file of entry thresholds")
 	flag.Parse()
 
 	// Initialize logger
 	log := logger.NewLogger()
+	defer log.Close()
 	log.Info("Starting Trading System")
 
 	// Create and initialize the trading manager
 	tradingManager := manager.NewManager(log)
+	if *config != "" {
+		tradingManager.SetConfigFile(*config)
+	}
+
+	switch *record {
+	case "":
+	case "ticks":
+		tradingManager.EnableRecording(false)
+	case "raw":
+		tradingManager.EnableRecording(true)
+	default:
+		fmt.Printf("Unknown record format: %s\n", *record)
+		return
+	}
 
 	// Start the trading system in the specified mode
 	switch *mode {
@@ -42,11 +59,15 @@ func main() {
 		return
 	}
 
-	// Wait for interrupt signal
+	// Wait for an interrupt signal, or for a backtest run to finish
+	// (Done is nil in live mode, so only the signal can end it)
 	sigChan := make(chan os.Signal, 1)
 	signal.Notify(sigChan, syscall.SIGINT, syscall.SIGTERM)
-	<-sigChan
+	select {
+	case <-sigChan:
+		fmt.Println("\nShutting down gracefully...")
+	case <-tradingManager.Done():
+	}
 
-	fmt.Println("\nShutting down gracefully...")
 	tradingManager.Shutdown()
 }
\ No newline at end of file
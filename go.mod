@@ -4,5 +4,4 @@ go 1.20
 
 require (
 	github.com/gorilla/websocket v1.5.0
-	github.com/montanaflynn/stats v0.7.0
 )
\ No newline at end of file
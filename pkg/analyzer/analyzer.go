@@ -3,222 +3,453 @@ package analyzer
 import (
 	"math"
 	"sync"
-	"time"
+	"sync/atomic"
 
-	"github.com/montanaflynn/stats"
 	"TRADE/pkg/logger"
 	"TRADE/pkg/market"
 	"TRADE/pkg/types"
 )
 
-// Analyzer calculates and analyzes market metrics
+// MetricsGate decides, from the trend metrics of the current tick, whether
+// the remaining metrics need to be calculated
+type MetricsGate func(trendStrength, avgTrendStrength float64) bool
+
+// calculateAll is the gate used when none is installed
+var calculateAll MetricsGate = func(trendStrength, avgTrendStrength float64) bool {
+	return true
+}
+
+// Metric windows
+const (
+	atrPeriod = 14  // ATR lookback and Wilder smoothing period
+	rsWindow  = 500 // Returns used for relative strength
+	merWindow = 30  // Prices used for the market efficiency ratio
+)
+
+// Trend strength regression window. x is always 0..n-1, so its mean and
+// sum of squared deviations, n(n^2-1)/12, are constants.
+const (
+	trendWindow = 30
+	trendXMean  = (trendWindow - 1) / 2.0
+	trendSxx    = trendWindow * (trendWindow*trendWindow - 1) / 12.0
+)
+
+// volatilityScale annualises the per-minute return deviation and converts it
+// to percent. math.Sqrt is not evaluated at compile time, so it is computed
+// once here rather than per tick.
+var volatilityScale = math.Sqrt(252*1440) * 100
+
+// Average trend strength window, and the samples needed before it is reported
+const (
+	trendAvgWindow = 20
+	trendAvgMin    = 7
+)
+
+// Analyzer calculates and analyzes market metrics.
+// ProcessTick has a single caller, the market data feed, and is the only
+// writer of the tick-path state (trend average, ATR, MER path, scratch
+// buffers), which it uses without locking. The mutex guards only the
+// published metrics, which other goroutines read.
 type Analyzer struct {
 	market          *market.MarketData
 	logger          *logger.Logger
 	metrics         *types.MarketMetrics
-	trendStrengthWindow []float64
-	warmupTicks     int
-	warmupComplete  bool
+	trendStrengths  movingSum // Recent trend strengths, for their average
+	warmupTicks     atomic.Int64
+	warmupComplete  atomic.Bool
+	metricsGate     atomic.Pointer[MetricsGate] // Never nil
+	metricsStale    bool
+	atr             float64 // Wilder-smoothed ATR state
+	atrSeeded       bool
+	merPath         movingSum // |price moves| over the MER window
+	merSeeded       bool
+	priceBuf        []float64 // Price history scratch, reused by the tick path
 	mutex           sync.RWMutex
 }
 
 // NewAnalyzer creates a new market analyzer
 func NewAnalyzer(marketData *market.MarketData, log *logger.Logger) *Analyzer {
-	return &Analyzer{
+	a := &Analyzer{
 		market:          marketData,
 		logger:          log,
 		metrics:         types.NewMarketMetrics(),
-		trendStrengthWindow: make([]float64, 0, 20),
-		warmupTicks:     300, // Default warmup period
-		warmupComplete:  false,
+		trendStrengths:  newMovingSum(trendAvgWindow),
+		merPath:         newMovingSum(merWindow - 1),
 	}
+	a.warmupTicks.Store(300) // Default warmup period
+	a.metricsGate.Store(&calculateAll)
+	return a
 }
 
 // SetWarmupTicks sets the number of ticks required before analysis starts
 func (a *Analyzer) SetWarmupTicks(ticks int) {
-	a.mutex.Lock()
-	defer a.mutex.Unlock()
-	a.warmupTicks = ticks
+	a.warmupTicks.Store(int64(ticks))
+}
+
+// SetMetricsGate installs a gate that lets the analyzer skip the costlier
+// metrics on ticks where they cannot change the trading decision. A nil gate
+// calculates every metric on every tick. The choice is made here, once, so
+// the tick path neither locks to read the gate nor checks it for nil.
+func (a *Analyzer) SetMetricsGate(gate MetricsGate) {
+	if gate == nil {
+		gate = calculateAll
+	}
+	a.metricsGate.Store(&gate)
 }
 
 // HasSufficientData checks if we have enough data for analysis
 func (a *Analyzer) HasSufficientData() bool {
-	return a.warmupComplete
+	return a.warmupComplete.Load()
 }
 
-// ProcessTick processes a new market tick and updates metrics
-func (a *Analyzer) ProcessTick(tick *types.TickData) *types.MarketMetrics {
-	// Check if we have minimum data for analysis
-	if !a.market.HasMinimumData(20) {
-		return nil
+// ProcessTick processes a new market tick and updates metrics.
+// The snapshot is returned by value so the per-tick path does not allocate;
+// ok is false until there is enough data for analysis.
+func (a *Analyzer) ProcessTick(tick *types.TickData) (metrics types.MarketMetrics, ok bool) {
+	// Check if we have minimum data for analysis, and that none of it is NaN.
+	// The incremental state misses every tick skipped here, so it is dropped
+	// and reseeded from the clean window once analysis resumes.
+	if !a.market.HasMinimumData(20) || a.market.HasInvalidData() {
+		a.resetIncremental()
+		return metrics, false
 	}
 	
-	// Calculate metrics
-	a.calculateMetrics()
+	// Calculate metrics; the copy returned is taken while publishing them
+	metrics = a.calculateMetrics()
 	
 	// Check if warmup is complete
-	if !a.warmupComplete && a.market.HasMinimumData(a.warmupTicks) {
-		a.mutex.Lock()
-		a.warmupComplete = true
-		a.mutex.Unlock()
+	if !a.warmupComplete.Load() && a.market.HasMinimumData(int(a.warmupTicks.Load())) {
+		a.warmupComplete.Store(true)
 		a.logger.Info("Warmup phase completed")
 	}
 	
-	// Return a copy of the metrics
-	return a.GetMetrics()
+	return metrics, true
 }
 
-// GetMetrics returns a copy of the current metrics
+// GetMetrics returns a copy of the current metrics, completing any
+// metrics that were skipped by the gate
 func (a *Analyzer) GetMetrics() *types.MarketMetrics {
+	a.refreshStaleMetrics()
+	metricsCopy := a.snapshotMetrics()
+	return &metricsCopy
+}
+
+// snapshotMetrics returns a value copy of the current metrics
+func (a *Analyzer) snapshotMetrics() types.MarketMetrics {
 	a.mutex.RLock()
 	defer a.mutex.RUnlock()
-	
-	// Create a copy of the metrics
-	metricsCopy := &types.MarketMetrics{
-		RealizedVolatility:   a.metrics.RealizedVolatility,
-		ATR:                  a.metrics.ATR,
-		RelativeStrength:     a.metrics.RelativeStrength,
-		OrderImbalance:       a.metrics.OrderImbalance,
-		TrendStrength:        a.metrics.TrendStrength,
-		AvgTrendStrength:     a.metrics.AvgTrendStrength,
-		MarketEfficiencyRatio: a.metrics.MarketEfficiencyRatio,
-	}
-	
-	return metricsCopy
+	return *a.metrics
 }
 
-// calculateMetrics calculates all market metrics
-func (a *Analyzer) calculateMetrics() {
-	a.mutex.Lock()
-	defer a.mutex.Unlock()
-	
-	// Get price and volume data
-	prices := a.market.GetPriceArray()
+// calculateMetrics calculates all market metrics. Inputs are copied out of
+// the market data and all math runs without holding the analyzer lock; the
+// results are published in one short critical section. Trend metrics are
+// always updated; the rest are skipped when the metrics gate reports that
+// they cannot affect the decision for this tick.
+// It runs on the tick path only, which also owns the trend strength average and the
+// ATR and MER path state. It returns a copy of the metrics as published, so
+// the tick path does not lock again to read them back.
+func (a *Analyzer) calculateMetrics() types.MarketMetrics {
+	// Get price data, into the same buffer every tick
+	prices := a.market.CopyPriceArray(a.priceBuf)
+	a.priceBuf = prices
 	if len(prices) < 2 {
-		return
+		return a.snapshotMetrics()
 	}
 	
-	// Calculate returns
-	returns := make([]float64, len(prices)-1)
-	for i := 1; i < len(prices); i++ {
-		returns[i-1] = (prices[i] / prices[i-1]) - 1
-	}
-	
-	// Calculate realized volatility
-	stdDev, _ := stats.StandardDeviation(returns)
-	realizedVolatility := stdDev * math.Sqrt(252*1440) * 100
-	
-	// Calculate ATR (Average True Range)
-	atr := a.calculateATR(prices)
-	
-	// Calculate relative strength
-	relativeStrength := a.calculateRelativeStrength(returns)
-	
-	// Calculate order imbalance
-	orderImbalance := a.calculateOrderImbalance()
-	
-	// Calculate trend strength
+	// Calculate trend strength first: it feeds the rolling average on every
+	// tick and is the cheapest way to rule out an entry
 	trendStrength := a.calculateTrendStrength(prices)
 	
-	// Update trend strength window
-	if len(a.trendStrengthWindow) >= 20 {
-		a.trendStrengthWindow = a.trendStrengthWindow[1:]
+	// Update the average trend strength
+	sum := a.trendStrengths.add(trendStrength)
+	avgTrendStrength := 0.0
+	if a.trendStrengths.count >= trendAvgMin {
+		avgTrendStrength = sum / float64(a.trendStrengths.count)
 	}
-	a.trendStrengthWindow = append(a.trendStrengthWindow, trendStrength)
 	
-	// Calculate average trend strength
-	avgTrendStrength := 0.0
-	if len(a.trendStrengthWindow) >= 7 {
-		sum := 0.0
-		for _, v := range a.trendStrengthWindow {
-			sum += v
-		}
-		avgTrendStrength = sum / float64(len(a.trendStrengthWindow))
+	// ATR and the MER path length are maintained incrementally, so they are
+	// updated on every tick
+	atr := a.updateATR(prices)
+	pathLength := a.updateMERPath(prices)
+	
+	// Skip the remaining metrics if the gate rules this tick out
+	gate := *a.metricsGate.Load()
+	if !gate(trendStrength, avgTrendStrength) {
+		a.mutex.Lock()
+		a.metrics.TrendStrength = trendStrength
+		a.metrics.AvgTrendStrength = avgTrendStrength
+		a.metrics.ATR = atr
+		a.metricsStale = true
+		published := *a.metrics
+		a.mutex.Unlock()
+		return published
 	}
 	
-	// Calculate market efficiency ratio
-	mer := a.calculateMarketEfficiencyRatio(prices)
+	gated := a.calculateGatedMetrics(prices, pathLength)
 	
-	// Update metrics
-	a.metrics.RealizedVolatility = realizedVolatility
-	a.metrics.ATR = atr
-	a.metrics.RelativeStrength = relativeStrength
-	a.metrics.OrderImbalance = orderImbalance
+	a.mutex.Lock()
 	a.metrics.TrendStrength = trendStrength
 	a.metrics.AvgTrendStrength = avgTrendStrength
-	a.metrics.MarketEfficiencyRatio = mer
+	a.metrics.ATR = atr
+	a.publishGatedMetrics(&gated)
+	published := *a.metrics
+	a.mutex.Unlock()
+	return published
 }
 
-// calculateATR calculates the Average True Range
-func (a *Analyzer) calculateATR(prices []float64) float64 {
-	highPrices := a.market.GetHighPricesArray()
-	lowPrices := a.market.GetLowPricesArray()
+// calculateGatedMetrics calculates the metrics that the metrics gate may
+// skip. It reads only its arguments and the market data, so it runs without
+// the analyzer lock; only the gated fields of the result are set.
+// pathLength is the sum of |price moves| over the last merWindow prices.
+func (a *Analyzer) calculateGatedMetrics(prices []float64, pathLength float64) types.MarketMetrics {
+	window := reducePriceWindow(prices)
+	
+	// Relative strength: gains / (gains + losses), where gains + losses is
+	// the sum of |returns| and gains is half of that plus the plain sum
+	relativeStrength := 0.5
+	if len(prices) > 2 && window.absReturnSum != 0 {
+		relativeStrength = 0.5 * (window.absReturnSum + window.returnSum) / window.absReturnSum
+	}
 	
-	if len(highPrices) < 14 || len(lowPrices) < 14 || len(prices) < 14 {
-		// Not enough data, use volatility as a proxy
-		if len(prices) > 0 {
-			return a.metrics.RealizedVolatility * prices[len(prices)-1] / 100
-		}
-		return 0
+	// Market efficiency ratio
+	mer := 0.5
+	if len(prices) >= merWindow && pathLength != 0 {
+		mer = math.Abs(prices[len(prices)-1]-prices[len(prices)-merWindow]) / pathLength
 	}
 	
-	// Use the last 14 periods for ATR calculation
-	period := 14
-	highPrices = highPrices[len(highPrices)-period:]
-	lowPrices = lowPrices[len(lowPrices)-period:]
-	closes := prices[len(prices)-period-1 : len(prices)-1]
+	return types.MarketMetrics{
+		RealizedVolatility:    window.stdDev * volatilityScale,
+		RelativeStrength:      relativeStrength,
+		OrderImbalance:        a.calculateOrderImbalance(),
+		MarketEfficiencyRatio: mer,
+	}
+}
+
+// priceWindowStats holds the reductions over the price window that feed
+// volatility and relative strength
+type priceWindowStats struct {
+	stdDev       float64 // Population standard deviation of returns
+	returnSum    float64 // Sum of returns over the last rsWindow
+	absReturnSum float64 // Sum of |returns| over the last rsWindow
+}
+
+// reducePriceWindow walks the price window once, computing the returns and
+// every reduction over them in the same pass instead of materialising a
+// returns slice and scanning it per metric. The variance uses Welford's
+// update, which stays accurate in a single pass. The loop is split at the
+// start of the relative strength window, and the RS sums need no sign test,
+// so the loop body has no branches.
+func reducePriceWindow(prices []float64) priceWindowStats {
+	var window priceWindowStats
+	n := len(prices)
+	if n < 2 {
+		return window
+	}
 	
-	// Calculate true ranges
-	trueRanges := make([]float64, period)
-	for i := 0; i < period; i++ {
-		// True Range is the greatest of:
-		// 1. Current High - Current Low
-		// 2. |Current High - Previous Close|
-		// 3. |Current Low - Previous Close|
-		tr1 := highPrices[i] - lowPrices[i]
-		tr2 := math.Abs(highPrices[i] - closes[i])
-		tr3 := math.Abs(lowPrices[i] - closes[i])
-		
-		trueRanges[i] = math.Max(tr1, math.Max(tr2, tr3))
+	// First price index whose return is in the RS window
+	rsStart := n - rsWindow
+	if rsStart < 1 {
+		rsStart = 1
 	}
 	
-	// Calculate average
-	sum := 0.0
-	for _, tr := range trueRanges {
-		sum += tr
+	mean, m2 := 0.0, 0.0
+	for i := 1; i < rsStart; i++ {
+		ret := prices[i]/prices[i-1] - 1
+		delta := ret - mean
+		mean += delta / float64(i)
+		m2 += delta * (ret - mean)
+	}
+	for i := rsStart; i < n; i++ {
+		ret := prices[i]/prices[i-1] - 1
+		delta := ret - mean
+		mean += delta / float64(i)
+		m2 += delta * (ret - mean)
+		
+		window.returnSum += ret
+		window.absReturnSum += math.Abs(ret)
 	}
 	
-	return sum / float64(period)
+	window.stdDev = math.Sqrt(m2 / float64(n-1))
+	return window
 }
 
-// calculateRelativeStrength calculates the Relative Strength
-func (a *Analyzer) calculateRelativeStrength(returns []float64) float64 {
-	if len(returns) < 2 {
-		return 0.5
+// publishGatedMetrics stores freshly calculated gated metrics; the caller
+// holds the write lock
+func (a *Analyzer) publishGatedMetrics(gated *types.MarketMetrics) {
+	a.metrics.RealizedVolatility = gated.RealizedVolatility
+	a.metrics.RelativeStrength = gated.RelativeStrength
+	a.metrics.OrderImbalance = gated.OrderImbalance
+	a.metrics.MarketEfficiencyRatio = gated.MarketEfficiencyRatio
+	a.metricsStale = false
+}
+
+// refreshStaleMetrics fills in metrics skipped by the gate, for readers
+// outside the tick path that need a complete snapshot
+func (a *Analyzer) refreshStaleMetrics() {
+	a.mutex.RLock()
+	stale := a.metricsStale
+	a.mutex.RUnlock()
+	if !stale {
+		return
 	}
 	
-	// Use up to 500 most recent returns
-	window := int(math.Min(500, float64(len(returns))))
-	windowReturns := returns[len(returns)-window:]
+	prices := a.market.GetPriceArray()
+	if len(prices) < 2 {
+		return
+	}
+	gated := a.calculateGatedMetrics(prices, pathLength(prices, merWindow-1))
 	
-	// Calculate gains and losses
-	gains := 0.0
-	losses := 0.0
+	// The tick path may have published newer values in the meantime
+	a.mutex.Lock()
+	if a.metricsStale {
+		a.publishGatedMetrics(&gated)
+	}
+	a.mutex.Unlock()
+}
+
+// updateMERPath adds the latest price move to the market efficiency path
+// length and returns it. The first call seeds it from the price window.
+// Like the ATR, it must see every tick.
+func (a *Analyzer) updateMERPath(prices []float64) float64 {
+	n := len(prices)
+	if !a.merSeeded {
+		start := n - merWindow + 1
+		if start < 1 {
+			start = 1
+		}
+		for i := start; i < n; i++ {
+			a.merPath.add(math.Abs(prices[i] - prices[i-1]))
+		}
+		a.merSeeded = true
+		return a.merPath.sum
+	}
 	
-	for _, ret := range windowReturns {
-		if ret > 0 {
-			gains += ret
-		} else {
-			losses -= ret
+	return a.merPath.add(math.Abs(prices[n-1] - prices[n-2]))
+}
+
+// pathLength returns the sum of the last moves |price moves| in prices
+func pathLength(prices []float64, moves int) float64 {
+	start := len(prices) - moves
+	if start < 1 {
+		start = 1
+	}
+	sum := 0.0
+	for i := start; i < len(prices); i++ {
+		sum += math.Abs(prices[i] - prices[i-1])
+	}
+	return sum
+}
+
+// resetIncremental discards the state carried from tick to tick: the trend
+// strength average, the ATR and the MER path
+func (a *Analyzer) resetIncremental() {
+	a.trendStrengths.reset()
+	a.merPath.reset()
+	a.merSeeded = false
+	a.atrSeeded = false
+}
+
+// movingSum keeps the sum of the most recent samples in a fixed window.
+// Each sample is added once and subtracted once when it leaves; the sum is
+// recomputed exactly each time the window wraps, so rounding error cannot
+// build up.
+type movingSum struct {
+	values []float64
+	next   int
+	count  int
+	sum    float64
+}
+
+// newMovingSum creates a moving sum over size samples
+func newMovingSum(size int) movingSum {
+	return movingSum{values: make([]float64, size)}
+}
+
+// reset empties the window without releasing its storage
+func (m *movingSum) reset() {
+	m.next = 0
+	m.count = 0
+	m.sum = 0
+}
+
+// add pushes a sample, dropping the oldest once the window is full, and
+// returns the new sum
+func (m *movingSum) add(v float64) float64 {
+	if m.count == len(m.values) {
+		m.sum -= m.values[m.next]
+	} else {
+		m.count++
+	}
+	m.values[m.next] = v
+	m.sum += v
+	
+	m.next++
+	if m.next == len(m.values) {
+		m.next = 0
+		m.sum = 0
+		for _, value := range m.values[:m.count] {
+			m.sum += value
 		}
 	}
+	return m.sum
+}
+
+// updateATR advances the Average True Range by the latest bar using Wilder's
+// smoothing, atr = (atr*(n-1) + tr) / n. It is seeded with the simple average
+// of the first atrPeriod true ranges. It runs on every tick, ahead of the
+// metrics gate, since each bar must enter the smoothing exactly once.
+func (a *Analyzer) updateATR(prices []float64) float64 {
+	if len(prices) < atrPeriod+1 {
+		return 0
+	}
 	
-	// Calculate RS
-	if gains+losses == 0 {
-		return 0.5
+	if !a.atrSeeded {
+		a.atr = a.seedATR(prices)
+		a.atrSeeded = true
+		return a.atr
+	}
+	
+	high, low := a.market.GetLatestHighLow()
+	tr := trueRange(high, low, prices[len(prices)-2])
+	a.atr = (a.atr*(atrPeriod-1) + tr) / atrPeriod
+	return a.atr
+}
+
+// seedATR calculates the simple average true range over the last atrPeriod bars
+func (a *Analyzer) seedATR(prices []float64) float64 {
+	highPrices := a.market.GetHighPricesArray()
+	lowPrices := a.market.GetLowPricesArray()
+	if len(highPrices) < atrPeriod || len(lowPrices) < atrPeriod {
+		return 0
 	}
 	
-	return gains / (gains + losses)
+	highPrices = highPrices[len(highPrices)-atrPeriod:]
+	lowPrices = lowPrices[len(lowPrices)-atrPeriod:]
+	closes := prices[len(prices)-atrPeriod-1 : len(prices)-1]
+	
+	sum := 0.0
+	for i := 0; i < atrPeriod; i++ {
+		sum += trueRange(highPrices[i], lowPrices[i], closes[i])
+	}
+	return sum / atrPeriod
+}
+
+// trueRange returns the greatest of:
+// 1. Current High - Current Low
+// 2. |Current High - Previous Close|
+// 3. |Current Low - Previous Close|
+// Plain comparisons are used rather than math.Max, whose NaN and signed-zero
+// handling is not needed here: invalid ticks never reach the analyzer.
+func trueRange(high, low, prevClose float64) float64 {
+	tr := high - low
+	if d := math.Abs(high - prevClose); d > tr {
+		tr = d
+	}
+	if d := math.Abs(low - prevClose); d > tr {
+		tr = d
+	}
+	return tr
 }
 
 // calculateOrderImbalance calculates the order imbalance
@@ -244,84 +475,34 @@ func (a *Analyzer) calculateOrderImbalance() float64 {
 }
 
 // calculateTrendStrength calculates the trend strength using linear regression
+// over the last trendWindow prices
 func (a *Analyzer) calculateTrendStrength(prices []float64) float64 {
-	if len(prices) < 30 {
+	if len(prices) < trendWindow {
 		return 0.0
 	}
 	
 	// Use last 30 prices for trend calculation
-	windowPrices := prices[len(prices)-30:]
-	x := make([]float64, len(windowPrices))
-	for i := range x {
-		x[i] = float64(i)
-	}
+	windowPrices := prices[len(prices)-trendWindow:]
 	
-	// Calculate linear regression
-	slope, intercept, r := linearRegression(x, windowPrices)
-	
-	// Scale slope by r-squared and price level
-	meanPrice, _ := stats.Mean(windowPrices)
-	trendStrength := slope * r * r * (30 / meanPrice) * 100000
-	
-	return trendStrength
-}
-
-// calculateMarketEfficiencyRatio calculates the Market Efficiency Ratio
-func (a *Analyzer) calculateMarketEfficiencyRatio(prices []float64) float64 {
-	if len(prices) < 30 {
-		return 0.5
+	meanPrice := 0.0
+	for _, p := range windowPrices {
+		meanPrice += p
 	}
-	
-	// Net directional movement
-	netMovement := math.Abs(prices[len(prices)-1] - prices[len(prices)-30])
-	
-	// Total price path length
-	pathLength := 0.0
-	for i := len(prices) - 29; i < len(prices); i++ {
-		pathLength += math.Abs(prices[i] - prices[i-1])
+	meanPrice /= trendWindow
+	
+	// Closed-form regression against x = 0..n-1, on deviations from the means
+	sxy, syy := 0.0, 0.0
+	for i, p := range windowPrices {
+		dy := p - meanPrice
+		sxy += (float64(i) - trendXMean) * dy
+		syy += dy * dy
 	}
-	
-	// Calculate MER
-	if pathLength == 0 {
-		return 0.5
+	if syy == 0 {
+		return 0.0
 	}
+	slope := sxy / trendSxx
+	rSquared := sxy * sxy / (trendSxx * syy)
 	
-	return netMovement / pathLength
+	// Scale slope by r-squared and price level
+	return slope * rSquared * (trendWindow / meanPrice) * 100000
 }
-
-// linearRegression calculates linear regression parameters
-func linearRegression(x, y []float64) (slope, intercept, r float64) {
-	n := float64(len(x))
-	
-	if n != float64(len(y)) || n < 2 {
-		return 0, 0, 0
-	}
-	
-	sumX, sumY := 0.0, 0.0
-	sumXY, sumXX := 0.0, 0.0
-	sumYY := 0.0
-	
-	for i := 0; i < len(x); i++ {
-		sumX += x[i]
-		sumY += y[i]
-		sumXY += x[i] * y[i]
-		sumXX += x[i] * x[i]
-		sumYY += y[i] * y[i]
-	}
-	
-	// Calculate slope and intercept
-	slope = (n*sumXY - sumX*sumY) / (n*sumXX - sumX*sumX)
-	intercept = (sumY - slope*sumX) / n
-	
-	// Calculate correlation coefficient
-	numerator := n*sumXY - sumX*sumY
-	denominator := math.Sqrt((n*sumXX - sumX*sumX) * (n*sumYY - sumY*sumY))
-	
-	if denominator == 0 {
-		r = 0
-	} else {
-		r = numerator / denominator
-	}
-	
-	return slope, intercept, r
-}
\ No newline at end of file
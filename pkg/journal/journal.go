@@ -0,0 +1,404 @@
+package journal
+
+import (
+	"bufio"
+	"encoding/csv"
+	"fmt"
+	"math"
+	"os"
+	"path/filepath"
+	"sort"
+	"strconv"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"TRADE/pkg/logger"
+	"TRADE/pkg/types"
+)
+
+// Journal file writer parameters
+const (
+	writeBatchSize = 64          // Rows buffered before a flush at most
+	flushInterval  = time.Second // Longest a row waits before it is written
+)
+
+// journalHeader is the first row of a journal file
+var journalHeader = []string{"entry_time", "exit_time", "entry_price", "exit_price", "pnl", "reason"}
+
+// TradeJournal keeps the completed trades of a session. Trades are held in
+// entry-time order, so a query for recent trades is a binary search rather
+// than a scan, and statistics over the whole journal are kept up to date as
+// trades are added.
+// Readers never lock: each write publishes a new immutable snapshot, and
+// readers work on whichever snapshot is current. The mutex only orders
+// writers.
+type TradeJournal struct {
+	snapshot atomic.Pointer[journalSnapshot]
+	logger   *logger.Logger
+	mutex    sync.Mutex
+	
+	// Persistence: rows wait in pending, guarded by the mutex, until the
+	// background writer swaps them out. Every trade reaches the file.
+	pending    [][]string
+	wake       chan struct{}
+	writerDone chan struct{}
+}
+
+// journalSnapshot is the journal state at one point in time. It is never
+// modified once published.
+type journalSnapshot struct {
+	trades tradeColumns // Sorted by entry time
+	totals performance  // Running statistics over all trades
+}
+
+// NewTradeJournal creates an empty trade journal
+func NewTradeJournal(log *logger.Logger) *TradeJournal {
+	j := &TradeJournal{
+		logger: log,
+	}
+	j.snapshot.Store(&journalSnapshot{totals: newPerformance()})
+	return j
+}
+
+// Persist appends every trade added from now on to the CSV file at filePath,
+// creating it if needed. Rows are written by a background goroutine in
+// batches, so adding a trade never waits on the filesystem; a row reaches
+// the file within flushInterval.
+func (j *TradeJournal) Persist(filePath string) error {
+	j.mutex.Lock()
+	defer j.mutex.Unlock()
+	
+	if j.wake != nil {
+		return fmt.Errorf("journal is already persisted")
+	}
+	
+	if err := os.MkdirAll(filepath.Dir(filePath), 0755); err != nil {
+		return fmt.Errorf("failed to create journal directory: %v", err)
+	}
+	
+	file, err := os.OpenFile(filePath, os.O_CREATE|os.O_WRONLY|os.O_APPEND, 0644)
+	if err != nil {
+		return fmt.Errorf("failed to open journal file: %v", err)
+	}
+	
+	// A new file starts with the header
+	info, err := file.Stat()
+	if err != nil {
+		file.Close()
+		return fmt.Errorf("failed to open journal file: %v", err)
+	}
+	buffer := bufio.NewWriter(file)
+	writer := csv.NewWriter(buffer)
+	if info.Size() == 0 {
+		writer.Write(journalHeader)
+	}
+	
+	j.wake = make(chan struct{}, 1)
+	j.writerDone = make(chan struct{})
+	go j.runWriter(file, buffer, writer, j.wake)
+	
+	return nil
+}
+
+// Close writes out any queued trades, syncs and closes the journal file
+func (j *TradeJournal) Close() {
+	j.mutex.Lock()
+	wake, done := j.wake, j.writerDone
+	j.wake = nil
+	j.mutex.Unlock()
+	
+	if wake == nil {
+		return
+	}
+	close(wake)
+	<-done
+}
+
+// runWriter writes pending rows each time it is woken, until wake is closed.
+// It flushes once writeBatchSize rows are buffered, or whatever arrived
+// within flushInterval.
+func (j *TradeJournal) runWriter(file *os.File, buffer *bufio.Writer, writer *csv.Writer, wake <-chan struct{}) {
+	defer close(j.writerDone)
+	defer file.Close()
+	
+	ticker := time.NewTicker(flushInterval)
+	defer ticker.Stop()
+	
+	pending := 0
+	flush := func() {
+		writer.Flush()
+		if err := buffer.Flush(); err != nil {
+			j.logger.Errorf("Failed to write trade journal: %v", err)
+		}
+		pending = 0
+	}
+	
+	// Rows are swapped out under the lock and written outside it; the two
+	// slices trade places so neither is reallocated in steady state
+	var rows [][]string
+	write := func() {
+		j.mutex.Lock()
+		rows, j.pending = j.pending, rows[:0]
+		j.mutex.Unlock()
+		
+		for i, row := range rows {
+			writer.Write(row)
+			rows[i] = nil
+		}
+		pending += len(rows)
+		if pending >= writeBatchSize {
+			flush()
+		}
+	}
+	
+	for {
+		select {
+		case _, ok := <-wake:
+			write()
+			if !ok {
+				flush()
+				if err := file.Sync(); err != nil {
+					j.logger.Errorf("Failed to sync trade journal: %v", err)
+				}
+				return
+			}
+		case <-ticker.C:
+			if pending > 0 {
+				flush()
+			}
+		}
+	}
+}
+
+// AddTrade records a completed trade
+func (j *TradeJournal) AddTrade(trade types.TradeRecord) {
+	// Format the row before taking the lock
+	row := formatTrade(&trade)
+	
+	j.mutex.Lock()
+	defer j.mutex.Unlock()
+	
+	// Insert after any trades with the same entry time, keeping add order.
+	// Times are converted to milliseconds once and stored as integers.
+	current := j.snapshot.Load()
+	entry, exit := trade.EntryTime.UnixMilli(), trade.ExitTime.UnixMilli()
+	i := sort.Search(current.trades.len(), func(i int) bool {
+		return current.trades.entryTimes[i] > entry
+	})
+	
+	next := &journalSnapshot{
+		trades: current.trades.inserted(i, entry, exit, &trade),
+		totals: current.totals,
+	}
+	// Drawdown depends on order, so a trade landing before the end means
+	// the totals are rebuilt in entry order
+	if i == current.trades.len() {
+		next.totals.add(trade.PnL)
+	} else {
+		next.totals = summarize(next.trades.pnl)
+	}
+	j.snapshot.Store(next)
+	
+	// Handed to the writer under the lock so Close cannot close wake
+	// mid-send. Nothing is dropped: pending grows if the writer falls
+	// behind, and one wake-up covers every row added before it runs.
+	if j.wake != nil {
+		j.pending = append(j.pending, row)
+		select {
+		case j.wake <- struct{}{}:
+		default:
+		}
+	}
+}
+
+// formatTrade converts a trade to a journal file row
+func formatTrade(trade *types.TradeRecord) []string {
+	return []string{
+		trade.EntryTime.Format(time.RFC3339Nano),
+		trade.ExitTime.Format(time.RFC3339Nano),
+		strconv.FormatFloat(trade.EntryPrice, 'f', -1, 64),
+		strconv.FormatFloat(trade.ExitPrice, 'f', -1, 64),
+		strconv.FormatFloat(trade.PnL, 'f', -1, 64),
+		trade.Reason.String(),
+	}
+}
+
+// GetTrades returns a copy of the trades entered at or after since.
+// A zero since returns every trade.
+func (j *TradeJournal) GetTrades(since time.Time) []types.TradeRecord {
+	columns := &j.snapshot.Load().trades
+	
+	start := columns.searchEntry(since)
+	trades := make([]types.TradeRecord, 0, columns.len()-start)
+	for i := start; i < columns.len(); i++ {
+		trades = append(trades, columns.record(i))
+	}
+	return trades
+}
+
+// AnalyzePerformance returns statistics for the trades entered at or after
+// since. A zero since covers every trade and is answered from the running
+// totals without touching the trades.
+func (j *TradeJournal) AnalyzePerformance(since time.Time) types.PerformanceMetrics {
+	snap := j.snapshot.Load()
+	if since.IsZero() {
+		return snap.totals.metrics()
+	}
+	
+	perf := summarize(snap.trades.pnl[snap.trades.searchEntry(since):])
+	return perf.metrics()
+}
+
+// Len returns the number of recorded trades
+func (j *TradeJournal) Len() int {
+	return j.snapshot.Load().trades.len()
+}
+
+// tradeColumns stores trades as parallel columns, so statistics and
+// time searches each walk one contiguous array. Times are milliseconds
+// since epoch, the resolution of the market data.
+type tradeColumns struct {
+	entryTimes  []int64
+	exitTimes   []int64
+	entryPrices []float64
+	exitPrices  []float64
+	pnl         []float64
+	reasons     []types.ExitReason
+}
+
+// len returns the number of trades
+func (c *tradeColumns) len() int {
+	return len(c.pnl)
+}
+
+// searchEntry returns the index of the first trade entered at or after since
+func (c *tradeColumns) searchEntry(since time.Time) int {
+	if since.IsZero() {
+		return 0
+	}
+	cutoff := since.UnixMilli()
+	return sort.Search(c.len(), func(i int) bool {
+		return c.entryTimes[i] >= cutoff
+	})
+}
+
+// inserted returns the columns with a trade placed at index i, leaving c
+// unchanged for readers still holding it. The trade's times are passed in
+// milliseconds.
+func (c *tradeColumns) inserted(i int, entryMs, exitMs int64, trade *types.TradeRecord) tradeColumns {
+	return tradeColumns{
+		entryTimes:  insertAt(c.entryTimes, i, entryMs),
+		exitTimes:   insertAt(c.exitTimes, i, exitMs),
+		entryPrices: insertAt(c.entryPrices, i, trade.EntryPrice),
+		exitPrices:  insertAt(c.exitPrices, i, trade.ExitPrice),
+		pnl:         insertAt(c.pnl, i, trade.PnL),
+		reasons:     insertAt(c.reasons, i, trade.Reason),
+	}
+}
+
+// record rebuilds the trade at index i
+func (c *tradeColumns) record(i int) types.TradeRecord {
+	return types.TradeRecord{
+		EntryTime:  time.UnixMilli(c.entryTimes[i]),
+		ExitTime:   time.UnixMilli(c.exitTimes[i]),
+		EntryPrice: c.entryPrices[i],
+		ExitPrice:  c.exitPrices[i],
+		PnL:        c.pnl[i],
+		Reason:     c.reasons[i],
+	}
+}
+
+// insertAt returns s with v inserted at index i, without modifying s[:len(s)].
+// Appending at the end, the usual case as trades close in order, reuses
+// spare capacity: writes past len(s) are invisible to holders of s, and
+// writers are serialised. An insert elsewhere copies.
+func insertAt[T any](s []T, i int, v T) []T {
+	if i == len(s) {
+		return append(s, v)
+	}
+	out := make([]T, len(s)+1, cap(s)+1)
+	copy(out, s[:i])
+	out[i] = v
+	copy(out[i+1:], s[i:])
+	return out
+}
+
+// performance accumulates trade statistics one trade at a time, so every
+// statistic comes out of a single pass with no intermediate slices
+type performance struct {
+	count       int
+	wins        int
+	pnlSum      float64
+	grossProfit float64
+	grossLoss   float64
+	best        float64
+	worst    float64
+	cumPnL   float64
+	peakPnL  float64
+	drawdown float64
+}
+
+// newPerformance creates an empty accumulator
+func newPerformance() performance {
+	return performance{
+		best:  math.Inf(-1),
+		worst: math.Inf(1),
+	}
+}
+
+// summarize accumulates the statistics of a PnL column in one pass
+func summarize(pnls []float64) performance {
+	p := newPerformance()
+	for _, pnl := range pnls {
+		p.add(pnl)
+	}
+	return p
+}
+
+// add folds one trade's PnL into the statistics
+func (p *performance) add(pnl float64) {
+	p.count++
+	p.pnlSum += pnl
+	if pnl > 0 {
+		p.wins++
+		p.grossProfit += pnl
+	} else {
+		p.grossLoss -= pnl
+	}
+	if pnl > p.best {
+		p.best = pnl
+	}
+	if pnl < p.worst {
+		p.worst = pnl
+	}
+	
+	// Drawdown of the cumulative PnL curve from its running peak
+	p.cumPnL += pnl
+	if p.cumPnL > p.peakPnL {
+		p.peakPnL = p.cumPnL
+	}
+	if p.peakPnL-p.cumPnL > p.drawdown {
+		p.drawdown = p.peakPnL - p.cumPnL
+	}
+}
+
+// metrics returns the accumulated statistics
+func (p *performance) metrics() types.PerformanceMetrics {
+	if p.count == 0 {
+		return *types.NewPerformanceMetrics()
+	}
+	return types.PerformanceMetrics{
+		TotalTrades:   p.count,
+		WinningTrades: p.wins,
+		LosingTrades:  p.count - p.wins,
+		WinRate:       float64(p.wins) / float64(p.count) * 100,
+		AveragePnL:    p.pnlSum / float64(p.count),
+		TotalPnL:      p.pnlSum,
+		GrossProfit:   p.grossProfit,
+		GrossLoss:     p.grossLoss,
+		BestTrade:     p.best,
+		WorstTrade:    p.worst,
+		MaxDrawdown:   p.drawdown,
+	}
+}
@@ -0,0 +1,180 @@
+package journal
+
+import (
+	"bytes"
+	"encoding/csv"
+	"fmt"
+	"os"
+	"sort"
+	"strconv"
+	"time"
+
+	"TRADE/pkg/types"
+)
+
+// journalFields is the number of fields in a journal row
+const journalFields = 6
+
+// Load reads the trades of an existing journal file into an empty journal.
+// A missing file is not an error. The file is read in one go and split in
+// place; only a file with quoted fields goes through encoding/csv.
+func (j *TradeJournal) Load(filePath string) error {
+	data, err := os.ReadFile(filePath)
+	if os.IsNotExist(err) {
+		return nil
+	}
+	if err != nil {
+		return fmt.Errorf("failed to read journal file: %v", err)
+	}
+	
+	loaded := &journalSnapshot{}
+	if bytes.IndexByte(data, '"') >= 0 {
+		err = loaded.readQuoted(data)
+	} else {
+		err = loaded.readPlain(data)
+	}
+	if err != nil {
+		return fmt.Errorf("failed to parse journal file: %v", err)
+	}
+	// Totals are taken in entry order, the order AnalyzePerformance walks
+	loaded.trades.sortByEntry()
+	loaded.totals = summarize(loaded.trades.pnl)
+	
+	j.mutex.Lock()
+	defer j.mutex.Unlock()
+	
+	if j.snapshot.Load().trades.len() != 0 {
+		return fmt.Errorf("journal already has trades")
+	}
+	j.snapshot.Store(loaded)
+	return nil
+}
+
+// readPlain parses a journal file with no quoted fields
+func (s *journalSnapshot) readPlain(data []byte) error {
+	var fields [journalFields][]byte
+	for line := 1; len(data) > 0; line++ {
+		row := data
+		if end := bytes.IndexByte(data, '\n'); end >= 0 {
+			row, data = data[:end], data[end+1:]
+		} else {
+			data = nil
+		}
+		row = bytes.TrimSuffix(row, []byte{'\r'})
+		if len(row) == 0 || (line == 1 && bytes.HasPrefix(row, []byte(journalHeader[0]))) {
+			continue
+		}
+		
+		n := 0
+		for n < journalFields-1 {
+			comma := bytes.IndexByte(row, ',')
+			if comma < 0 {
+				break
+			}
+			fields[n], row = row[:comma], row[comma+1:]
+			n++
+		}
+		fields[n] = row
+		if n != journalFields-1 {
+			return fmt.Errorf("line %d: expected %d fields", line, journalFields)
+		}
+		if err := s.appendRow(&fields); err != nil {
+			return fmt.Errorf("line %d: %v", line, err)
+		}
+	}
+	return nil
+}
+
+// readQuoted parses a journal file with encoding/csv
+func (s *journalSnapshot) readQuoted(data []byte) error {
+	reader := csv.NewReader(bytes.NewReader(data))
+	reader.FieldsPerRecord = journalFields
+	records, err := reader.ReadAll()
+	if err != nil {
+		return err
+	}
+	
+	var fields [journalFields][]byte
+	for i, record := range records {
+		if i == 0 && record[0] == journalHeader[0] {
+			continue
+		}
+		for k := range fields {
+			fields[k] = []byte(record[k])
+		}
+		if err := s.appendRow(&fields); err != nil {
+			return fmt.Errorf("record %d: %v", i+1, err)
+		}
+	}
+	return nil
+}
+
+// appendRow parses one row and appends it to the columns, in file order
+func (s *journalSnapshot) appendRow(fields *[journalFields][]byte) error {
+	entryTime, err := time.Parse(time.RFC3339Nano, string(fields[0]))
+	if err != nil {
+		return err
+	}
+	exitTime, err := time.Parse(time.RFC3339Nano, string(fields[1]))
+	if err != nil {
+		return err
+	}
+	entryPrice, err := strconv.ParseFloat(string(fields[2]), 64)
+	if err != nil {
+		return err
+	}
+	exitPrice, err := strconv.ParseFloat(string(fields[3]), 64)
+	if err != nil {
+		return err
+	}
+	pnl, err := strconv.ParseFloat(string(fields[4]), 64)
+	if err != nil {
+		return err
+	}
+	reason, ok := types.ParseExitReason(string(fields[5]))
+	if !ok {
+		return fmt.Errorf("unknown exit reason %q", fields[5])
+	}
+	
+	c := &s.trades
+	c.entryTimes = append(c.entryTimes, entryTime.UnixMilli())
+	c.exitTimes = append(c.exitTimes, exitTime.UnixMilli())
+	c.entryPrices = append(c.entryPrices, entryPrice)
+	c.exitPrices = append(c.exitPrices, exitPrice)
+	c.pnl = append(c.pnl, pnl)
+	c.reasons = append(c.reasons, reason)
+	return nil
+}
+
+// sortByEntry puts the columns in entry-time order. Journal files are
+// written in exit order, which for one open trade at a time is already
+// entry order, so this is usually just the check.
+func (c *tradeColumns) sortByEntry() {
+	if sort.SliceIsSorted(c.entryTimes, func(a, b int) bool { return c.entryTimes[a] < c.entryTimes[b] }) {
+		return
+	}
+	
+	order := make([]int, c.len())
+	for i := range order {
+		order[i] = i
+	}
+	sort.SliceStable(order, func(a, b int) bool {
+		return c.entryTimes[order[a]] < c.entryTimes[order[b]]
+	})
+	
+	c.entryTimes = permute(c.entryTimes, order)
+	c.exitTimes = permute(c.exitTimes, order)
+	c.entryPrices = permute(c.entryPrices, order)
+	c.exitPrices = permute(c.exitPrices, order)
+	c.pnl = permute(c.pnl, order)
+	c.reasons = permute(c.reasons, order)
+}
+
+// permute returns s reordered so that element i is s[order[i]]
+func permute[T any](s []T, order []int) []T {
+	out := make([]T, len(s))
+	for i, k := range order {
+		out[i] = s[k]
+	}
+	return out
+}
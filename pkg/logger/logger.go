@@ -1,11 +1,12 @@
 package logger
 
 import (
+	"bufio"
 	"fmt"
 	"log"
 	"os"
-	"path/filepath"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"TRADE/pkg/types"
@@ -23,50 +24,82 @@ const (
 	CRITICAL
 )
 
-// Logger provides logging functionality with different severity levels
+// Log writer parameters
+const (
+	logQueueSize     = 4096                   // Messages that can wait for the writer
+	logBufferSize    = 64 * 1024              // Bytes buffered before a write
+	logBatchSize     = 512                    // Messages written per flush at most
+	logFlushInterval = 500 * time.Millisecond // Longest a message waits in the buffer
+)
+
+// Logger provides logging functionality with different severity levels.
+// Messages are written by a background goroutine, so a log call costs the
+// formatting and a channel send; the file write happens off the caller's
+// path. The writer buffers its output and flushes it in batches. Close
+// flushes any queued messages.
 type Logger struct {
 	logFile    *os.File
+	buffer     *bufio.Writer // Output of logger, flushed by the writer
 	logger     *log.Logger
-	level      LogLevel
-	mutex      sync.Mutex
+	level      atomic.Int32 // Minimum LogLevel written; read without the mutex
+	mutex      sync.RWMutex // Guards queue against Close
+	queue      chan logEntry
+	writerDone chan struct{}
+	dropped    atomic.Int64 // Debug messages dropped on a full queue
 	statusChan chan string
 	statusDone chan struct{}
 }
 
+// logEntry is a message waiting for the log writer
+type logEntry struct {
+	level   LogLevel
+	message string
+}
+
+// Log files are named after their creation time. The layout holds the whole
+// path, so building it is a single time format.
+const (
+	logsDir       = "logs"
+	logPathLayout = logsDir + "/trade_2006-01-02_15-04-05.log"
+)
+
 // NewLogger creates a new logger instance
 func NewLogger() *Logger {
 	// Create logs directory if it doesn't exist
-	logsDir := "logs"
-	if _, err := os.Stat(logsDir); os.IsNotExist(err) {
-		os.Mkdir(logsDir, 0755)
-	}
+	os.MkdirAll(logsDir, 0755)
 
 	// Create log file with timestamp in name
-	timestamp := time.Now().Format("2006-01-02_15-04-05")
-	logPath := filepath.Join(logsDir, fmt.Sprintf("trade_%s.log", timestamp))
-	
+	logPath := time.Now().Format(logPathLayout)
+
 	file, err := os.Create(logPath)
 	if err != nil {
 		log.Printf("Failed to create log file: %v", err)
-		return &Logger{
-			logger:     log.New(os.Stdout, "", log.LstdFlags),
-			level:      INFO,
+		buffer := bufio.NewWriterSize(os.Stdout, logBufferSize)
+		l := &Logger{
+			buffer:     buffer,
+			logger:     log.New(buffer, "", log.LstdFlags),
 			statusChan: make(chan string, 10),
 			statusDone: make(chan struct{}),
 		}
+		l.SetLevel(INFO)
+		l.startWriter()
+		return l
 	}
 	
 	// Create logger with file and stdout output
-	logger := log.New(file, "", log.LstdFlags)
+	buffer := bufio.NewWriterSize(file, logBufferSize)
+	logger := log.New(buffer, "", log.LstdFlags)
 	
 	// Start status reporter
 	l := &Logger{
 		logFile:    file,
+		buffer:     buffer,
 		logger:     logger,
-		level:      INFO,
 		statusChan: make(chan string, 10),
 		statusDone: make(chan struct{}),
 	}
+	l.SetLevel(INFO)
+	l.startWriter()
 	
 	go l.statusReporter()
 	
@@ -74,6 +107,53 @@ func NewLogger() *Logger {
 	return l
 }
 
+// startWriter starts the goroutine that writes queued messages
+func (l *Logger) startWriter() {
+	l.queue = make(chan logEntry, logQueueSize)
+	l.writerDone = make(chan struct{})
+	go l.runWriter(l.queue)
+}
+
+// runWriter writes queued messages in order until the queue is closed.
+// Output is flushed every logBatchSize messages, at least every
+// logFlushInterval, and straight after an error so it is on disk if the
+// process dies.
+func (l *Logger) runWriter(queue <-chan logEntry) {
+	defer close(l.writerDone)
+	
+	ticker := time.NewTicker(logFlushInterval)
+	defer ticker.Stop()
+	
+	pending := 0
+	for {
+		select {
+		case entry, ok := <-queue:
+			if !ok {
+				l.flush()
+				return
+			}
+			l.write(entry.level, entry.message)
+			pending++
+			if pending >= logBatchSize || entry.level >= ERROR {
+				l.flush()
+				pending = 0
+			}
+		case <-ticker.C:
+			if pending > 0 {
+				l.flush()
+				pending = 0
+			}
+		}
+	}
+}
+
+// flush writes out buffered log output
+func (l *Logger) flush() {
+	if err := l.buffer.Flush(); err != nil {
+		log.Printf("Failed to write log file: %v", err)
+	}
+}
+
 // statusReporter prints status updates to the console
 func (l *Logger) statusReporter() {
 	for {
@@ -88,35 +168,70 @@ func (l *Logger) statusReporter() {
 
 // SetLevel sets the minimum log level
 func (l *Logger) SetLevel(level LogLevel) {
-	l.mutex.Lock()
-	defer l.mutex.Unlock()
-	l.level = level
+	l.level.Store(int32(level))
+}
+
+// IsEnabled reports whether messages at the given level are written. It is a
+// single atomic load, cheap enough to guard debug output on per-tick paths.
+func (l *Logger) IsEnabled(level LogLevel) bool {
+	return int32(level) >= l.level.Load()
+}
+
+// levelPrefixes holds the tag written before each message, indexed by level
+var levelPrefixes = [...]string{
+	DEBUG:    "[DEBUG] ",
+	INFO:     "[INFO] ",
+	WARNING:  "[WARNING] ",
+	ERROR:    "[ERROR] ",
+	CRITICAL: "[CRITICAL] ",
 }
 
 // log writes a log message with the specified level
 func (l *Logger) log(level LogLevel, message string) {
-	l.mutex.Lock()
-	defer l.mutex.Unlock()
-	
-	if level < l.level {
+	if !l.IsEnabled(level) {
+		return
+	}
+	l.enqueue(level, message)
+}
+
+// enqueue hands a message to the log writer. On a full queue, debug
+// messages are dropped and counted, so a burst of diagnostics cannot hold up
+// the trading path behind the writer. Everything else, including the INFO
+// lines that record signals, blocks the caller rather than being lost.
+// After Close the message is written directly.
+func (l *Logger) enqueue(level LogLevel, message string) {
+	l.mutex.RLock()
+	if l.queue != nil {
+		entry := logEntry{level: level, message: message}
+		if level > DEBUG {
+			l.queue <- entry
+		} else {
+			select {
+			case l.queue <- entry:
+			default:
+				l.dropped.Add(1)
+			}
+		}
+		l.mutex.RUnlock()
 		return
 	}
+	l.mutex.RUnlock()
 	
-	levelStr := "INFO"
-	switch level {
-	case DEBUG:
-		levelStr = "DEBUG"
-	case INFO:
-		levelStr = "INFO"
-	case WARNING:
-		levelStr = "WARNING"
-	case ERROR:
-		levelStr = "ERROR"
-	case CRITICAL:
-		levelStr = "CRITICAL"
+	l.mutex.Lock()
+	defer l.mutex.Unlock()
+	l.write(level, message)
+	l.flush()
+}
+
+// write outputs a message that has passed the level check. It is called by
+// the log writer, or under the write lock once the writer has stopped.
+func (l *Logger) write(level LogLevel, message string) {
+	prefix := levelPrefixes[INFO]
+	if level >= DEBUG && int(level) < len(levelPrefixes) {
+		prefix = levelPrefixes[level]
 	}
 	
-	logMessage := fmt.Sprintf("[%s] %s", levelStr, message)
+	logMessage := prefix + message
 	l.logger.Println(logMessage)
 	
 	// Also print to stdout for ERROR and CRITICAL
@@ -130,26 +245,122 @@ func (l *Logger) Debug(message string) {
 	l.log(DEBUG, message)
 }
 
+// logf formats and writes a log message. The level is checked without
+// locking and the arguments are only formatted when it is enabled, so
+// bursts of errors (e.g. malformed frames during an exchange outage) cost
+// no more than necessary.
+func (l *Logger) logf(level LogLevel, format string, args ...interface{}) {
+	if !l.IsEnabled(level) {
+		return
+	}
+	l.enqueue(level, fmt.Sprintf(format, args...))
+}
+
+// Debugf logs a formatted debug message
+func (l *Logger) Debugf(format string, args ...interface{}) {
+	l.logf(DEBUG, format, args...)
+}
+
 // Info logs an info message
 func (l *Logger) Info(message string) {
 	l.log(INFO, message)
 }
 
+// Infof logs a formatted info message
+func (l *Logger) Infof(format string, args ...interface{}) {
+	l.logf(INFO, format, args...)
+}
+
 // Warning logs a warning message
 func (l *Logger) Warning(message string) {
 	l.log(WARNING, message)
 }
 
+// Warningf logs a formatted warning message
+func (l *Logger) Warningf(format string, args ...interface{}) {
+	l.logf(WARNING, format, args...)
+}
+
 // Error logs an error message
 func (l *Logger) Error(message string) {
 	l.log(ERROR, message)
 }
 
+// Errorf logs a formatted error message
+func (l *Logger) Errorf(format string, args ...interface{}) {
+	l.logf(ERROR, format, args...)
+}
+
 // Critical logs a critical message
 func (l *Logger) Critical(message string) {
 	l.log(CRITICAL, message)
 }
 
+// RateLimit is a token bucket for throttling a repetitive log message,
+// such as a per-tick or per-row warning that could otherwise flood the log
+type RateLimit struct {
+	mutex      sync.Mutex
+	rate       float64 // Tokens added per second
+	burst      float64 // Bucket capacity
+	tokens     float64
+	last       time.Time
+	suppressed int64 // Messages refused since the last one allowed
+}
+
+// NewRateLimit creates a limit allowing burst messages at once and rate
+// per second on average
+func NewRateLimit(rate float64, burst int) *RateLimit {
+	return &RateLimit{
+		rate:   rate,
+		burst:  float64(burst),
+		tokens: float64(burst),
+	}
+}
+
+// allow takes a token if one is available. When it does, it also returns
+// the number of messages suppressed since the last one allowed.
+func (r *RateLimit) allow() (bool, int64) {
+	r.mutex.Lock()
+	defer r.mutex.Unlock()
+	
+	now := time.Now()
+	if !r.last.IsZero() {
+		r.tokens += now.Sub(r.last).Seconds() * r.rate
+		if r.tokens > r.burst {
+			r.tokens = r.burst
+		}
+	}
+	r.last = now
+	
+	if r.tokens < 1 {
+		r.suppressed++
+		return false, 0
+	}
+	r.tokens--
+	suppressed := r.suppressed
+	r.suppressed = 0
+	return true, suppressed
+}
+
+// Throttledf logs a formatted message if limit allows it, noting how many
+// were suppressed since the last one written. The level is checked first,
+// so a disabled level costs neither a token nor any formatting.
+func (l *Logger) Throttledf(limit *RateLimit, level LogLevel, format string, args ...interface{}) {
+	if !l.IsEnabled(level) {
+		return
+	}
+	ok, suppressed := limit.allow()
+	if !ok {
+		return
+	}
+	
+	message := fmt.Sprintf(format, args...)
+	if suppressed > 0 {
+		message += fmt.Sprintf(" (%d similar messages suppressed)", suppressed)
+	}
+	l.enqueue(level, message)
+}
+
 // ReportStatus sends a status update to the console
 func (l *Logger) ReportStatus(status string) {
 	select {
@@ -157,22 +368,36 @@ func (l *Logger) ReportStatus(status string) {
 		// Status sent
 	default:
 		// Channel full, log it instead
-		l.Info(fmt.Sprintf("Status update: %s", status))
+		l.Infof("Status update: %s", status)
 	}
 }
 
+// Market status report layouts. The two variants share everything but the
+// trade line, so both are assembled once at compile time.
+const (
+	marketStatusHeader = "\n=== MARKET STATUS ===\n" +
+		"Price: %.6f | Vol: %.2f%% | RS: %.2f\n" +
+		"Trend: %.2f | Order Imb: %.2f | MER: %.2f\n"
+	marketStatusFooter = "====================="
+	
+	marketStatusActiveFormat = marketStatusHeader + "Active Trade | Current PnL: %.2f%%\n" + marketStatusFooter
+	marketStatusIdleFormat   = marketStatusHeader + "No Active Trade\n" + marketStatusFooter
+)
+
 // ReportMarketStatus reports the current market status
 func (l *Logger) ReportMarketStatus(price float64, metrics *types.MarketMetrics, tradeActive bool, tradePnL float64) {
+	// Skip formatting if the report could go nowhere: the console queue is
+	// full and the fallback log level is disabled
+	if len(l.statusChan) == cap(l.statusChan) && !l.IsEnabled(INFO) {
+		return
+	}
+	
 	// Format market status message
 	var statusMsg string
 	
 	if tradeActive {
 		statusMsg = fmt.Sprintf(
-			"\n=== MARKET STATUS ===\n"+
-			"Price: %.6f | Vol: %.2f%% | RS: %.2f\n"+
-			"Trend: %.2f | Order Imb: %.2f | MER: %.2f\n"+
-			"Active Trade | Current PnL: %.2f%%\n"+
-			"=====================",
+			marketStatusActiveFormat,
 			price,
 			metrics.RealizedVolatility,
 			metrics.RelativeStrength,
@@ -183,11 +408,7 @@ func (l *Logger) ReportMarketStatus(price float64, metrics *types.MarketMetrics,
 		)
 	} else {
 		statusMsg = fmt.Sprintf(
-			"\n=== MARKET STATUS ===\n"+
-			"Price: %.6f | Vol: %.2f%% | RS: %.2f\n"+
-			"Trend: %.2f | Order Imb: %.2f | MER: %.2f\n"+
-			"No Active Trade\n"+
-			"=====================",
+			marketStatusIdleFormat,
 			price,
 			metrics.RealizedVolatility,
 			metrics.RelativeStrength,
@@ -200,8 +421,21 @@ func (l *Logger) ReportMarketStatus(price float64, metrics *types.MarketMetrics,
 	l.ReportStatus(statusMsg)
 }
 
-// Close closes the logger and its resources
+// Close writes out any queued messages and closes the logger and its resources
 func (l *Logger) Close() {
+	// Stop the log writer once it has drained the queue
+	l.mutex.Lock()
+	queue := l.queue
+	l.queue = nil
+	l.mutex.Unlock()
+	if queue != nil {
+		close(queue)
+		<-l.writerDone
+	}
+	if dropped := l.dropped.Load(); dropped > 0 {
+		l.Warningf("Log is missing %d debug messages: write queue was full", dropped)
+	}
+	
 	// Signal status reporter to stop
 	close(l.statusDone)
 	
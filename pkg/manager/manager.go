@@ -5,19 +5,40 @@ import (
 	"time"
 
 	"TRADE/pkg/analyzer"
+	"TRADE/pkg/journal"
 	"TRADE/pkg/logger"
 	"TRADE/pkg/market"
+	"TRADE/pkg/storage"
 	"TRADE/pkg/strategy"
 	"TRADE/pkg/types"
 )
 
+// journalFile is where live trades are journaled. It is kept out of the top
+// level of data/ so it is not offered as a backtest dataset.
+const journalFile = "data/journal/trades.csv"
+
+// staleDataThreshold is how long the live feed may go without trades before
+// the status reporter warns about it
+const staleDataThreshold = time.Minute
+
 // Manager coordinates all components of the trading system
 type Manager struct {
 	logger   *logger.Logger
 	market   *market.MarketData
 	analyzer *analyzer.Analyzer
 	strategy *strategy.Strategy
+	storage  *storage.DataStorage
+	journal  *journal.TradeJournal
 	running  bool
+	done     chan struct{}
+	stop     chan struct{} // Closed on shutdown to wake background loops
+	
+	// Live data recording
+	record    bool
+	recordRaw bool
+	
+	// Entry thresholds file, if any
+	configFile string
 }
 
 // NewManager creates a new trading system manager
@@ -28,6 +49,18 @@ func NewManager(log *logger.Logger) *Manager {
 	}
 }
 
+// EnableRecording records live market data under data/. A raw recording
+// stores websocket frames as received and runs no analysis.
+func (m *Manager) EnableRecording(raw bool) {
+	m.record = true
+	m.recordRaw = raw
+}
+
+// SetConfigFile loads the strategy's entry thresholds from a JSON file
+func (m *Manager) SetConfigFile(path string) {
+	m.configFile = path
+}
+
 // Initialize sets up all components of the trading system
 func (m *Manager) Initialize() error {
 	m.logger.Info("Initializing trading system components")
@@ -40,6 +73,18 @@ func (m *Manager) Initialize() error {
 
 	// Initialize strategy with analyzer
 	m.strategy = strategy.NewStrategy(m.analyzer, m.logger)
+	if m.configFile != "" {
+		thresholds, err := strategy.LoadBuyThresholds(m.configFile)
+		if err != nil {
+			m.logger.Errorf("Failed to load config: %v", err)
+			return err
+		}
+		m.strategy.SetBuyThresholds(thresholds)
+		m.logger.Infof("Loaded entry thresholds from %s", m.configFile)
+	}
+
+	// Initialize the journal of completed trades
+	m.journal = journal.NewTradeJournal(m.logger)
 
 	// Set up callbacks
 	m.setupCallbacks()
@@ -49,37 +94,58 @@ func (m *Manager) Initialize() error {
 
 // setupCallbacks configures event handlers between components
 func (m *Manager) setupCallbacks() {
+	// Only calculate the full metric set when the strategy can act on it
+	m.analyzer.SetMetricsGate(m.strategy.NeedsFullMetrics)
+	
+	// Components and the signal handler are bound once here rather than
+	// looked up through the manager on every tick
+	metricsSource, tradingStrategy := m.analyzer, m.strategy
+	emit := m.processSignal
+	
 	// Set up callback for when new market data is received
 	m.market.SetTickCallback(func(tick *types.TickData) {
 		// Process the tick through the analyzer
-		metrics := m.analyzer.ProcessTick(tick)
+		metrics, ok := metricsSource.ProcessTick(tick)
 		
 		// If we have valid metrics and enough data, check for trading signals
-		if metrics != nil && m.analyzer.HasSufficientData() {
+		if ok && metricsSource.HasSufficientData() {
 			// Generate trading signals based on the metrics
-			signal := m.strategy.GenerateSignal(tick.Price, tick.Timestamp, metrics)
+			signal := tradingStrategy.GenerateSignal(tick.Price, tick.Timestamp, &metrics)
 			
-			// Process any trading signals
+			// Process any trading signals; the signal is not kept afterwards
 			if signal != nil {
-				m.processSignal(signal, tick.Price, tick.Timestamp)
+				emit(signal)
+				types.ReleaseSignal(signal)
 			}
 		}
 	})
 }
 
 // processSignal handles trading signals from the strategy
-func (m *Manager) processSignal(signal *types.Signal, price float64, timestamp time.Time) {
+func (m *Manager) processSignal(signal *types.Signal) {
+	price, timestamp := signal.Price, signal.Time
+	
 	switch signal.Action {
-	case "BUY":
-		m.logger.Info(fmt.Sprintf("BUY SIGNAL at price %.6f", price))
+	case types.ActionBuy:
+		m.logger.Infof("BUY SIGNAL at price %.6f", price)
 		// Execute buy logic here
 		
-	case "SELL", "CLOSE":
-		m.logger.Info(fmt.Sprintf("SELL SIGNAL at price %.6f (reason: %s)", price, signal.Reason))
+	case types.ActionSell, types.ActionClose:
+		m.logger.Infof("SELL SIGNAL at price %.6f (reason: %s, PnL: %.2f%%)", price, signal.Reason, signal.ProfitPercent)
 		// Execute sell logic here
 		
+		// The signal carries everything the journal needs about the trade
+		m.journal.AddTrade(types.TradeRecord{
+			EntryTime:  signal.EntryTime,
+			ExitTime:   timestamp,
+			EntryPrice: signal.EntryPrice,
+			ExitPrice:  price,
+			PnL:        signal.ProfitPercent,
+			Reason:     signal.Reason,
+		})
+		
 	default:
-		m.logger.Warning(fmt.Sprintf("Unknown signal action: %s", signal.Action))
+		m.logger.Warningf("Unknown signal action: %s", signal.Action)
 	}
 }
 
@@ -92,32 +158,83 @@ func (m *Manager) StartLiveMode() error {
 	m.running = true
 	m.logger.Info("Starting live trading mode")
 	
+	symbols := []string{"btcusdt"}
+	
+	// A raw recording needs no parsed ticks, so analysis is switched off and
+	// no trades can happen
+	analyse := !(m.record && m.recordRaw)
+	
+	// Keep a persistent journal of live trades, continuing any earlier one.
+	// The journal file is only read and opened when trades are possible.
+	if analyse {
+		if err := m.journal.Load(journalFile); err != nil {
+			m.logger.Errorf("Failed to load trade journal: %v", err)
+			return err
+		}
+		if err := m.journal.Persist(journalFile); err != nil {
+			m.logger.Errorf("Failed to open trade journal: %v", err)
+			return err
+		}
+	}
+	
+	// Start recording if requested
+	if m.record {
+		m.storage = storage.NewDataStorage("data", m.logger)
+		if err := m.storage.StartRecording(symbols[0], m.recordRaw); err != nil {
+			m.logger.Errorf("Failed to start recording: %v", err)
+			return err
+		}
+		m.market.SetDataStorage(m.storage)
+		if !analyse {
+			m.market.SetTickCallback(nil)
+		}
+	}
+	
 	// Connect to live market data
-	if err := m.market.ConnectLive([]string{"btcusdt"}); err != nil {
-		m.logger.Error(fmt.Sprintf("Failed to connect to live market: %v", err))
+	if err := m.market.ConnectLive(symbols); err != nil {
+		m.logger.Errorf("Failed to connect to live market: %v", err)
 		return err
 	}
 	
 	// Start periodic status reporting
-	go m.startStatusReporting()
+	m.stop = make(chan struct{})
+	go m.startStatusReporting(m.stop)
 	
 	return nil
 }
 
-// startStatusReporting periodically reports system status
-func (m *Manager) startStatusReporting() {
+// startStatusReporting periodically reports system status until stop is
+// closed. It sleeps between reports rather than polling, and wakes at once
+// on shutdown.
+func (m *Manager) startStatusReporting(stop <-chan struct{}) {
 	ticker := time.NewTicker(30 * time.Second)
 	defer ticker.Stop()
 	
+	lastPrice := 0.0
 	for {
-		if !m.running {
+		select {
+		case <-stop:
 			return
+		case <-ticker.C:
 		}
 		
-		<-ticker.C
+		// Pick up edits to the entry thresholds file
+		m.reloadConfig()
 		
-		// Get current market state
+		// Warn if the feed has gone quiet
+		if age := m.market.LastDataAge(); age > staleDataThreshold {
+			m.logger.Warningf("No market data for %s", age.Round(time.Second))
+		}
+		
+		// Nothing to report if the price has not moved; the price is a
+		// lock-free read, the rest of the state is only gathered on change
 		currentPrice := m.market.GetCurrentPrice()
+		if currentPrice == lastPrice {
+			continue
+		}
+		lastPrice = currentPrice
+		
+		// Get current market state
 		metrics := m.analyzer.GetMetrics()
 		tradeActive := m.strategy.IsActiveTrade()
 		
@@ -133,6 +250,25 @@ func (m *Manager) startStatusReporting() {
 	}
 }
 
+// reloadConfig applies the entry thresholds file again if it has changed.
+// LoadBuyThresholds caches by modification time, so an unchanged file
+// costs a stat.
+func (m *Manager) reloadConfig() {
+	if m.configFile == "" {
+		return
+	}
+	
+	thresholds, err := strategy.LoadBuyThresholds(m.configFile)
+	if err != nil {
+		m.logger.Warningf("Failed to reload config: %v", err)
+		return
+	}
+	if thresholds != m.strategy.GetBuyThresholds() {
+		m.strategy.SetBuyThresholds(thresholds)
+		m.logger.Infof("Reloaded entry thresholds from %s", m.configFile)
+	}
+}
+
 // StartBacktestMode starts the system in backtest mode
 func (m *Manager) StartBacktestMode() error {
 	if err := m.Initialize(); err != nil {
@@ -145,7 +281,7 @@ func (m *Manager) StartBacktestMode() error {
 	// Get available datasets
 	datasets, err := m.market.GetAvailableDatasets()
 	if err != nil {
-		m.logger.Error(fmt.Sprintf("Failed to get datasets: %v", err))
+		m.logger.Errorf("Failed to get datasets: %v", err)
 		return err
 	}
 	
@@ -164,32 +300,50 @@ func (m *Manager) StartBacktestMode() error {
 	selectedDataset := datasets[0]
 	fmt.Printf("\nSelected dataset: %s\n", selectedDataset)
 	
+	// Replay the dataset in the background so the caller stays responsive
+	// to shutdown requests
+	m.done = make(chan struct{})
+	go m.runBacktest(selectedDataset)
+	
+	return nil
+}
+
+// runBacktest loads and replays a dataset, then reports the results
+func (m *Manager) runBacktest(dataset string) {
+	defer close(m.done)
+	
 	// Load and process the dataset
-	if err := m.market.LoadHistoricalData(selectedDataset); err != nil {
-		m.logger.Error(fmt.Sprintf("Failed to load dataset: %v", err))
-		return err
+	if err := m.market.LoadHistoricalData(dataset); err != nil {
+		m.logger.Errorf("Failed to load dataset: %v", err)
+		return
 	}
 	
 	// Report final results
 	m.reportBacktestResults()
-	
-	return nil
+}
+
+// Done returns a channel that is closed when a backtest run finishes.
+// It is nil outside backtest mode.
+func (m *Manager) Done() <-chan struct{} {
+	return m.done
 }
 
 // reportBacktestResults reports the results of the backtest
 func (m *Manager) reportBacktestResults() {
-	// In a real implementation, this would calculate and report performance metrics
+	perf := m.journal.AnalyzePerformance(time.Time{})
+	
 	fmt.Println("\nBacktest Results:")
 	fmt.Println("=================")
-	fmt.Println("Backtest completed successfully")
-	
-	// If we had a performance tracker, we would report metrics like:
-	// - Total trades
-	// - Win rate
-	// - Average profit/loss
-	// - Maximum drawdown
-	// - Sharpe ratio
-	// etc.
+	fmt.Printf("Total trades:  %d (%d won, %d lost)\n", perf.TotalTrades, perf.WinningTrades, perf.LosingTrades)
+	if perf.TotalTrades == 0 {
+		return
+	}
+	fmt.Printf("Win rate:      %.2f%%\n", perf.WinRate)
+	fmt.Printf("Total PnL:     %.2f%%\n", perf.TotalPnL)
+	fmt.Printf("Average PnL:   %.2f%%\n", perf.AveragePnL)
+	fmt.Printf("Gross P / L:   %.2f%% / %.2f%%\n", perf.GrossProfit, perf.GrossLoss)
+	fmt.Printf("Best / worst:  %.2f%% / %.2f%%\n", perf.BestTrade, perf.WorstTrade)
+	fmt.Printf("Max drawdown:  %.2f%%\n", perf.MaxDrawdown)
 }
 
 // Shutdown gracefully stops all components
@@ -201,11 +355,33 @@ func (m *Manager) Shutdown() {
 	m.logger.Info("Shutting down trading system")
 	m.running = false
 	
+	// Stop background loops
+	if m.stop != nil {
+		close(m.stop)
+		m.stop = nil
+	}
+	
 	// Disconnect market data
 	if m.market != nil {
 		m.market.Disconnect()
 	}
 	
+	// A backtest stops at the next chunk boundary; wait for it, so nothing
+	// is logged or journaled after the journal and log are closed
+	if m.done != nil {
+		<-m.done
+	}
+	
+	// Flush any recording
+	if m.storage != nil {
+		m.storage.StopRecording()
+	}
+	
+	// Write out any journaled trades
+	if m.journal != nil {
+		m.journal.Close()
+	}
+	
 	// Perform any other cleanup
 	m.logger.Info("Trading system shutdown complete")
 }
\ No newline at end of file
@@ -2,39 +2,69 @@ package market
 
 import (
 	"encoding/csv"
-	"encoding/json"
 	"fmt"
+	"io"
 	"io/ioutil"
 	"math"
+	"math/rand"
 	"os"
 	"path/filepath"
 	"strconv"
 	"strings"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/gorilla/websocket"
 	"TRADE/pkg/logger"
+	"TRADE/pkg/storage"
 	"TRADE/pkg/types"
 )
 
 // TickCallback is a function that gets called when new market data is received
 type TickCallback func(tick *types.TickData)
 
+// replayChunkSize is the number of ticks replayed between stop checks
+const replayChunkSize = 65536
+
+// warningsPerSecond caps how often a repeated parse warning is logged
+const warningsPerSecond = 10
+
+// Websocket keepalive. Binance pings every 20 seconds and drops clients that
+// stop answering; a connection with no ping for wsReadTimeout is dead.
+const (
+	wsReadTimeout  = time.Minute
+	wsWriteTimeout = 10 * time.Second
+)
+
+// reconnectBackoff is the base wait before a reconnect, indexed by the number
+// of consecutive failed attempts and capped at the last entry
+var reconnectBackoff = [...]time.Duration{
+	1 * time.Second,
+	2 * time.Second,
+	4 * time.Second,
+	8 * time.Second,
+	16 * time.Second,
+	32 * time.Second,
+	60 * time.Second,
+}
+
+// frameQueueSize bounds the raw websocket frames buffered between the
+// reader and the tick processor
+const frameQueueSize = 4096
+
 // MarketData handles market data acquisition and storage
 type MarketData struct {
-	// Data storage
-	priceHistory []float64
-	volumeHistory []float64
-	bidVolume []float64
-	askVolume []float64
-	timeStamps []time.Time
-	highPrices []float64
-	lowPrices []float64
+	// Data storage, as fixed-size ring buffers. Bid and ask volumes keep
+	// their own windows since each tick only lands on one side.
+	history tickHistory
+	bidVolume ring[float64]
+	askVolume ring[float64]
 	
 	// Configuration
 	maxSize int
 	roundNum int
+	roundShift float64 // 10^roundNum
 	prevPrice float64
 	
 	// Websocket connection for live data
@@ -42,41 +72,70 @@ type MarketData struct {
 	wsActive bool
 	symbols []string
 	
-	// Callback for new data
-	tickCallback TickCallback
+	// Callback for new data. It is published atomically, so dispatching a
+	// tick never takes the mutex for it.
+	tickCallback atomic.Pointer[TickCallback]
+	
+	// Set by Disconnect and never cleared, so a replay that has not started
+	// yet (its dataset may still be loading) does not start either
+	stopped atomic.Bool
+	
+	// Optional recorder for live data
+	storage *storage.DataStorage
 	
 	// Utilities
 	logger *logger.Logger
 	mutex sync.RWMutex
+	
+	// Throttles for warnings that can repeat per frame or per row
+	parseErrors *logger.RateLimit
+	rowWarnings *logger.RateLimit
+	
+	// Latest price and tick count, published after each write so the
+	// per-tick readers do not need the mutex
+	lastPrice    atomic.Uint64 // math.Float64bits of the price
+	tickCount    atomic.Int64
+	invalidTicks atomic.Int64 // Ticks in the history with a NaN price or volume
+	
+	// Exchange time of the latest live trade, in milliseconds since epoch
+	lastDataMs atomic.Int64
 }
 
 // NewMarketData creates a new market data handler
 func NewMarketData(log *logger.Logger) *MarketData {
+	maxSize := 1000
 	return &MarketData{
-		priceHistory: make([]float64, 0, 1000),
-		volumeHistory: make([]float64, 0, 1000),
-		bidVolume: make([]float64, 0, 1000),
-		askVolume: make([]float64, 0, 1000),
-		timeStamps: make([]time.Time, 0, 1000),
-		highPrices: make([]float64, 0, 1000),
-		lowPrices: make([]float64, 0, 1000),
-		maxSize: 1000,
+		history: newTickHistory(maxSize),
+		bidVolume: newRing[float64](maxSize),
+		askVolume: newRing[float64](maxSize),
+		maxSize: maxSize,
 		wsActive: false,
 		logger: log,
+		parseErrors: logger.NewRateLimit(warningsPerSecond, warningsPerSecond),
+		rowWarnings: logger.NewRateLimit(warningsPerSecond, warningsPerSecond),
 	}
 }
 
 // SetTickCallback sets the callback function for new market data
 func (md *MarketData) SetTickCallback(callback TickCallback) {
+	if callback == nil {
+		md.tickCallback.Store(nil)
+		return
+	}
+	md.tickCallback.Store(&callback)
+}
+
+// SetDataStorage sets a recorder for live data. With a raw recording and no
+// tick callback, frames are written as received and never parsed.
+func (md *MarketData) SetDataStorage(storage *storage.DataStorage) {
 	md.mutex.Lock()
 	defer md.mutex.Unlock()
-	md.tickCallback = callback
+	md.storage = storage
 }
 
 // AddTick adds a new tick to the market data
 func (md *MarketData) AddTick(tick *types.TickData) {
 	md.mutex.Lock()
-	defer md.mutex.Unlock()
 	
 	price := tick.Price
 	volume := tick.Volume
@@ -85,94 +144,87 @@ func (md *MarketData) AddTick(tick *types.TickData) {
 	
 	// Determine rounding precision if not set
 	if md.roundNum == 0 {
-		priceStr := fmt.Sprintf("%f", price)
-		parts := strings.Split(priceStr, ".")
-		if len(parts) > 1 {
-			md.roundNum = 6 - len(parts[0])
-			md.roundNum = int(math.Max(1, math.Min(8, float64(md.roundNum))))
-		} else {
-			md.roundNum = 2
-		}
+		md.roundNum = pricePrecision(price)
+		md.roundShift = math.Pow10(md.roundNum)
 		md.prevPrice = md.round(price)
 	}
 	
 	// Round price to appropriate precision
 	price = md.round(price)
 	
-	// Add data to histories with capacity management
-	md.addToLimitedSlice(&md.priceHistory, price)
-	md.addToLimitedSlice(&md.volumeHistory, volume)
-	md.addToLimitedSlice(&md.timeStamps, timestamp)
-	
-	// Update high and low prices
-	if len(md.highPrices) == 0 || price > md.highPrices[len(md.highPrices)-1] {
-		md.addToLimitedSlice(&md.highPrices, price)
-	} else {
-		md.addToLimitedSlice(&md.highPrices, md.highPrices[len(md.highPrices)-1])
-	}
-	
-	if len(md.lowPrices) == 0 || price < md.lowPrices[len(md.lowPrices)-1] {
-		md.addToLimitedSlice(&md.lowPrices, price)
-	} else {
-		md.addToLimitedSlice(&md.lowPrices, md.lowPrices[len(md.lowPrices)-1])
-	}
+	// Add the tick, with running high and low, as one history row; full
+	// rings drop their oldest entry
+	md.history.push(price, volume, timestamp)
+	md.lastPrice.Store(math.Float64bits(price))
+	md.tickCount.Store(int64(md.history.len()))
+	md.invalidTicks.Store(int64(md.history.invalid))
 	
 	// Update volume data
 	if isAsk {
-		md.addToLimitedSlice(&md.askVolume, volume)
+		md.askVolume.push(volume)
 	} else {
-		md.addToLimitedSlice(&md.bidVolume, volume)
+		md.bidVolume.push(volume)
 	}
 	
-	// Call the callback if set
-	if md.tickCallback != nil {
-		md.tickCallback(tick)
-	}
-}
-
-// Helper method to add to a slice with capacity management
-func (md *MarketData) addToLimitedSlice(slice interface{}, value interface{}) {
-	switch s := slice.(type) {
-	case *[]float64:
-		if len(*s) >= md.maxSize {
-			*s = append((*s)[1:], value.(float64))
-		} else {
-			*s = append(*s, value.(float64))
-		}
-	case *[]time.Time:
-		if len(*s) >= md.maxSize {
-			*s = append((*s)[1:], value.(time.Time))
-		} else {
-			*s = append(*s, value.(time.Time))
-		}
+	md.mutex.Unlock()
+	
+	// Call the callback if set. This happens outside the lock because
+	// consumers read the histories back through the RLock getters.
+	if callback := md.tickCallback.Load(); callback != nil {
+		(*callback)(tick)
 	}
 }
 
 // Helper function to round a float to the current precision
 func (md *MarketData) round(num float64) float64 {
-	shift := math.Pow(10, float64(md.roundNum))
-	return math.Round(num*shift) / shift
+	return math.Round(num*md.roundShift) / md.roundShift
+}
+
+// pricePrecision returns the number of decimals to keep for prices of this
+// magnitude: 6 minus the integer digits of the price printed with %f,
+// clamped to [1, 8]
+func pricePrecision(price float64) int {
+	// Count integer digits (and sign) as %f would print them
+	intPart := math.Trunc(math.Abs(math.Round(price*1e6) / 1e6))
+	digits := 1
+	for ; intPart >= 10; intPart /= 10 {
+		digits++
+	}
+	if price < 0 {
+		digits++
+	}
+	
+	precision := 6 - digits
+	if precision < 1 {
+		return 1
+	}
+	if precision > 8 {
+		return 8
+	}
+	return precision
 }
 
 // GetCurrentPrice returns the most recent price
 func (md *MarketData) GetCurrentPrice() float64 {
+	return math.Float64frombits(md.lastPrice.Load())
+}
+
+// GetPriceArray returns the price history as a slice
+func (md *MarketData) GetPriceArray() []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	if len(md.priceHistory) == 0 {
-		return 0
-	}
-	return md.priceHistory[len(md.priceHistory)-1]
+	return md.history.column(md.history.prices)
 }
 
-// GetPriceArray returns the price history as a slice
-func (md *MarketData) GetPriceArray() []float64 {
+// CopyPriceArray copies the price history into dst, reusing its storage, and
+// returns it. A caller that passes the same buffer on every tick reads the
+// history without allocating.
+func (md *MarketData) CopyPriceArray(dst []float64) []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	result := make([]float64, len(md.priceHistory))
-	copy(result, md.priceHistory)
-	return result
+	return md.history.columnInto(dst, md.history.prices)
 }
 
 // GetVolumeArray returns the volume history as a slice
@@ -180,9 +232,7 @@ func (md *MarketData) GetVolumeArray() []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	result := make([]float64, len(md.volumeHistory))
-	copy(result, md.volumeHistory)
-	return result
+	return md.history.column(md.history.volumes)
 }
 
 // GetBidVolumeArray returns the bid volume history as a slice
@@ -190,9 +240,7 @@ func (md *MarketData) GetBidVolumeArray() []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	result := make([]float64, len(md.bidVolume))
-	copy(result, md.bidVolume)
-	return result
+	return md.bidVolume.snapshot()
 }
 
 // GetAskVolumeArray returns the ask volume history as a slice
@@ -200,9 +248,7 @@ func (md *MarketData) GetAskVolumeArray() []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	result := make([]float64, len(md.askVolume))
-	copy(result, md.askVolume)
-	return result
+	return md.askVolume.snapshot()
 }
 
 // GetHighPricesArray returns the high prices history as a slice
@@ -210,9 +256,7 @@ func (md *MarketData) GetHighPricesArray() []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	result := make([]float64, len(md.highPrices))
-	copy(result, md.highPrices)
-	return result
+	return md.history.column(md.history.highs)
 }
 
 // GetLowPricesArray returns the low prices history as a slice
@@ -220,17 +264,40 @@ func (md *MarketData) GetLowPricesArray() []float64 {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	result := make([]float64, len(md.lowPrices))
-	copy(result, md.lowPrices)
-	return result
+	return md.history.column(md.history.lows)
 }
 
-// HasMinimumData checks if we have enough data for analysis
-func (md *MarketData) HasMinimumData(minTicks int) bool {
+// LastDataAge returns how long ago, by the exchange's trade time, the latest
+// live trade happened. It is zero before any live data has arrived.
+func (md *MarketData) LastDataAge() time.Duration {
+	lastMs := md.lastDataMs.Load()
+	if lastMs == 0 {
+		return 0
+	}
+	return time.Duration(time.Now().UnixMilli()-lastMs) * time.Millisecond
+}
+
+// GetLatestHighLow returns the running high and low as of the latest tick
+func (md *MarketData) GetLatestHighLow() (high, low float64) {
 	md.mutex.RLock()
 	defer md.mutex.RUnlock()
 	
-	return len(md.priceHistory) >= minTicks
+	if md.history.len() == 0 {
+		return 0, 0
+	}
+	i := md.history.lastIndex()
+	return md.history.highs[i], md.history.lows[i]
+}
+
+// HasMinimumData checks if we have enough data for analysis
+func (md *MarketData) HasMinimumData(minTicks int) bool {
+	return md.tickCount.Load() >= int64(minTicks)
+}
+
+// HasInvalidData reports whether the history holds a tick with a NaN price
+// or volume. It is tracked as ticks are added, so this is a single load.
+func (md *MarketData) HasInvalidData() bool {
+	return md.invalidTicks.Load() != 0
 }
 
 // Reset clears all market data
@@ -238,18 +305,19 @@ func (md *MarketData) Reset() {
 	md.mutex.Lock()
 	defer md.mutex.Unlock()
 	
-	md.priceHistory = md.priceHistory[:0]
-	md.volumeHistory = md.volumeHistory[:0]
-	md.bidVolume = md.bidVolume[:0]
-	md.askVolume = md.askVolume[:0]
-	md.timeStamps = md.timeStamps[:0]
-	md.highPrices = md.highPrices[:0]
-	md.lowPrices = md.lowPrices[:0]
+	md.history.reset()
+	md.bidVolume.reset()
+	md.askVolume.reset()
+	md.lastPrice.Store(0)
+	md.tickCount.Store(0)
+	md.invalidTicks.Store(0)
 	md.prevPrice = 0
 	md.roundNum = 0
+	md.roundShift = 0
 }
 
-// ConnectLive connects to live market data via WebSocket
+// ConnectLive connects to live market data via WebSocket. The connection is
+// re-established after failures until Disconnect is called.
 func (md *MarketData) ConnectLive(symbols []string) error {
 	md.mutex.Lock()
 	defer md.mutex.Unlock()
@@ -259,6 +327,7 @@ func (md *MarketData) ConnectLive(symbols []string) error {
 	}
 	
 	md.symbols = symbols
+	md.wsActive = true
 	
 	// Start WebSocket connection in a goroutine
 	go md.startWebSocketConnection()
@@ -266,90 +335,215 @@ func (md *MarketData) ConnectLive(symbols []string) error {
 	return nil
 }
 
-// startWebSocketConnection establishes and maintains the WebSocket connection
+// startWebSocketConnection establishes and maintains the WebSocket
+// connection, reconnecting with backoff until Disconnect is called
 func (md *MarketData) startWebSocketConnection() {
 	if len(md.symbols) == 0 {
 		md.logger.Error("No symbols specified for WebSocket connection")
+		md.mutex.Lock()
+		md.wsActive = false
+		md.mutex.Unlock()
 		return
 	}
 	
-	symbol := md.symbols[0]
-	url := fmt.Sprintf("wss://stream.binance.com:9443/ws/%s@trade", strings.ToLower(symbol))
+	// Subscribe to every symbol over one combined-stream connection
+	streams := make([]string, len(md.symbols))
+	for i, symbol := range md.symbols {
+		streams[i] = strings.ToLower(symbol) + "@trade"
+	}
+	url := "wss://stream.binance.com:9443/stream?streams=" + strings.Join(streams, "/")
+	
+	failures := 0
+	for md.isLive() {
+		if md.runWebSocketConnection(url) {
+			failures = 0
+		}
+		if !md.isLive() {
+			break
+		}
+		
+		// Back off from a table, plus up to a second of jitter
+		step := failures
+		if step >= len(reconnectBackoff) {
+			step = len(reconnectBackoff) - 1
+		}
+		delay := reconnectBackoff[step] + time.Duration(rand.Int63n(int64(time.Second)))
+		failures++
+		
+		md.logger.Warningf("Reconnecting in %s", delay.Round(time.Millisecond))
+		time.Sleep(delay)
+	}
 	
-	md.logger.Info(fmt.Sprintf("Connecting to %s", url))
+	md.logger.Info("WebSocket connection closed")
+}
+
+// runWebSocketConnection runs a single connection until it fails or is
+// closed, and reports whether it was established
+func (md *MarketData) runWebSocketConnection(url string) bool {
+	md.logger.Infof("Connecting to %s", url)
 	
 	// Connect to WebSocket
 	conn, _, err := websocket.DefaultDialer.Dial(url, nil)
 	if err != nil {
-		md.logger.Error(fmt.Sprintf("WebSocket connection error: %v", err))
-		return
+		md.logger.Errorf("WebSocket connection error: %v", err)
+		return false
 	}
 	
+	// Disconnect may have been called while dialing
 	md.mutex.Lock()
+	if !md.wsActive {
+		md.mutex.Unlock()
+		conn.Close()
+		return true
+	}
 	md.wsConn = conn
-	md.wsActive = true
 	md.mutex.Unlock()
 	
 	md.logger.Info("WebSocket connection established")
 	
-	// Handle incoming messages
+	// The exchange's pings serve as the heartbeat: each one answers with a
+	// pong and extends the read deadline, so no clock is read per frame
+	conn.SetReadDeadline(time.Now().Add(wsReadTimeout))
+	conn.SetPingHandler(func(appData string) error {
+		conn.SetReadDeadline(time.Now().Add(wsReadTimeout))
+		err := conn.WriteControl(websocket.PongMessage, []byte(appData), time.Now().Add(wsWriteTimeout))
+		if err == websocket.ErrCloseSent {
+			return nil
+		}
+		return err
+	})
+	
+	// Read frames on this goroutine and process them on another, so a slow
+	// analysis pass never delays draining the socket. Frame buffers are
+	// handed back once parsed and reused for later reads.
+	frames := make(chan []byte, frameQueueSize)
+	free := make(chan []byte, frameQueueSize)
+	processed := make(chan struct{})
+	go func() {
+		md.processFrames(frames, free)
+		close(processed)
+	}()
+	
 	for {
-		_, message, err := conn.ReadMessage()
+		var buf []byte
+		select {
+		case buf = <-free:
+		default:
+		}
+		
+		message, err := readFrame(conn, buf)
 		if err != nil {
-			md.logger.Error(fmt.Sprintf("WebSocket read error: %v", err))
+			if md.isLive() {
+				md.logger.Errorf("WebSocket read error: %v", err)
+			}
 			break
 		}
-		
-		// Parse message
-		var data map[string]interface{}
-		if err := json.Unmarshal(message, &data); err != nil {
-			md.logger.Error(fmt.Sprintf("JSON parse error: %v", err))
+		frames <- message
+	}
+	
+	// Let the processor finish what was already received
+	close(frames)
+	<-processed
+	
+	// Clean up
+	md.mutex.Lock()
+	if md.wsConn == conn {
+		md.wsConn = nil
+	}
+	md.mutex.Unlock()
+	conn.Close()
+	
+	return true
+}
+
+// isLive reports whether the live feed should stay connected
+func (md *MarketData) isLive() bool {
+	md.mutex.RLock()
+	defer md.mutex.RUnlock()
+	return md.wsActive
+}
+
+// processFrames parses queued websocket frames and feeds them through AddTick
+// until the channel is closed, returning each parsed frame's buffer on free.
+// The decoded trade and the tick handed to AddTick are reused for every
+// frame; the callback consumes the tick synchronously and must not retain
+// the pointer.
+func (md *MarketData) processFrames(frames <-chan []byte, free chan<- []byte) {
+	md.mutex.RLock()
+	recorder := md.storage
+	recordOnly := recorder != nil && md.tickCallback.Load() == nil && recorder.IsRaw()
+	md.mutex.RUnlock()
+	
+	var trade tradeMessage
+	tick := &types.TickData{}
+	for message := range frames {
+		// Nothing downstream needs parsed ticks: store the frame as is
+		if recordOnly {
+			recorder.RecordRaw(message)
+			select {
+			case free <- message:
+			default:
+			}
 			continue
 		}
 		
-		// Extract and normalize data
-		price, _ := data["p"].(string)
-		quantity, _ := data["q"].(string)
-		isMaker, _ := data["m"].(bool)
-		timestampMs, _ := data["T"].(float64)
-		
-		// Convert to appropriate types
-		priceFloat, err := strconv.ParseFloat(price, 64)
-		if err != nil {
-			md.logger.Error(fmt.Sprintf("Price parse error: %v", err))
-			continue
+		// Parse message straight into the typed struct. Nothing retains the
+		// frame afterwards, so its buffer can be reused.
+		err := parseTradeMessage(message, &trade)
+		select {
+		case free <- message:
+		default:
 		}
-		
-		quantityFloat, err := strconv.ParseFloat(quantity, 64)
 		if err != nil {
-			md.logger.Error(fmt.Sprintf("Quantity parse error: %v", err))
+			md.logger.Throttledf(md.parseErrors, logger.ERROR, "JSON parse error: %v", err)
 			continue
 		}
 		
-		timestamp := time.Unix(0, int64(timestampMs)*int64(time.Millisecond))
+		md.lastDataMs.Store(trade.TradeTime)
 		
-		// Create tick data
-		tick := &types.TickData{
-			Price:     priceFloat,
-			Volume:    quantityFloat,
-			IsAsk:     !isMaker,
-			Timestamp: timestamp,
-		}
+		// Fill the reused tick
+		tick.Symbol = trade.Symbol
+		tick.Price = trade.Price
+		tick.Volume = trade.Quantity
+		tick.IsAsk = !trade.IsMaker
+		tick.Timestamp = trade.TradeTime
 		
-		// Add tick to market data
+		// Add tick to market data. Analysis and signals come first; the
+		// recording can wait for them.
 		md.AddTick(tick)
+		
+		if recorder != nil {
+			recorder.RecordTick(tick)
+		}
+	}
+}
+
+// readFrame reads the next websocket message into buf's storage, growing it
+// only when a frame does not fit. Frames are passed on as raw bytes; the
+// parser works on them directly.
+func readFrame(conn *websocket.Conn, buf []byte) ([]byte, error) {
+	_, reader, err := conn.NextReader()
+	if err != nil {
+		return nil, err
 	}
 	
-	// Clean up
-	md.mutex.Lock()
-	md.wsConn = nil
-	md.wsActive = false
-	md.mutex.Unlock()
-	
-	md.logger.Info("WebSocket connection closed")
+	buf = buf[:0]
+	for {
+		if len(buf) == cap(buf) {
+			buf = append(buf, 0)[:len(buf)]
+		}
+		n, err := reader.Read(buf[len(buf):cap(buf)])
+		buf = buf[:len(buf)+n]
+		if err == io.EOF {
+			return buf, nil
+		}
+		if err != nil {
+			return nil, err
+		}
+	}
 }
 
-// Disconnect closes the WebSocket connection
+// Disconnect closes the WebSocket connection and stops any running replay
 func (md *MarketData) Disconnect() {
 	md.mutex.Lock()
 	defer md.mutex.Unlock()
@@ -360,6 +554,7 @@ func (md *MarketData) Disconnect() {
 	}
 	
 	md.wsActive = false
+	md.stopped.Store(true)
 }
 
 // GetAvailableDatasets returns a list of available historical datasets
@@ -389,93 +584,245 @@ func (md *MarketData) GetAvailableDatasets() ([]string, error) {
 
 // LoadHistoricalData loads and processes historical data from a CSV file
 func (md *MarketData) LoadHistoricalData(filePath string) error {
-	md.logger.Info(fmt.Sprintf("Loading historical data from %s", filePath))
+	md.logger.Infof("Loading historical data from %s", filePath)
+	
+	data, err := md.LoadDataset(filePath)
+	if err != nil {
+		return err
+	}
 	
 	// Reset current data
 	md.Reset()
 	
-	// Open the CSV file
-	file, err := os.Open(filePath)
+	md.ReplayHistoricalData(data)
+	
+	md.logger.Infof("Loaded %d historical data points", data.Len())
+	return nil
+}
+
+// LoadDataset reads a CSV file into column arrays without replaying it. The
+// file is read in one go, the columns are sized from its line count, and
+// rows are split in place; only a file with quoted fields goes through
+// encoding/csv.
+func (md *MarketData) LoadDataset(filePath string) (*types.HistoricalData, error) {
+	content, err := os.ReadFile(filePath)
 	if err != nil {
-		return fmt.Errorf("failed to open file: %v", err)
+		return nil, fmt.Errorf("failed to open file: %v", err)
 	}
-	defer file.Close()
 	
-	// Create a CSV reader
-	reader := csv.NewReader(file)
+	// Converted once, so every field below is a substring of the file
+	// rather than a separate allocation
+	text := string(content)
+	if strings.IndexByte(text, '"') >= 0 {
+		return md.loadQuotedDataset(text)
+	}
+	
+	// Read the header
+	header, rest := nextLine(text)
+	columns, err := findDatasetColumns(strings.Split(header, ","))
+	if err != nil {
+		return nil, err
+	}
+	
+	// Read and parse each row into the column arrays
+	data := newHistoricalData(strings.Count(rest, "\n") + 1)
+	fields := make([]string, 0, columns.count)
+	for len(rest) > 0 {
+		var line string
+		line, rest = nextLine(rest)
+		if line == "" {
+			continue
+		}
+		
+		fields = fields[:0]
+		for {
+			comma := strings.IndexByte(line, ',')
+			if comma < 0 {
+				fields = append(fields, line)
+				break
+			}
+			fields = append(fields, line[:comma])
+			line = line[comma+1:]
+		}
+		md.appendDatasetRow(data, &columns, fields)
+	}
+	
+	return data, nil
+}
+
+// loadQuotedDataset reads a CSV dataset with quoted fields using encoding/csv
+func (md *MarketData) loadQuotedDataset(text string) (*types.HistoricalData, error) {
+	// Create a CSV reader; rows are parsed immediately so the record
+	// slice can be reused between reads
+	reader := csv.NewReader(strings.NewReader(text))
+	reader.ReuseRecord = true
 	
 	// Read the header
 	header, err := reader.Read()
 	if err != nil {
-		return fmt.Errorf("failed to read header: %v", err)
+		return nil, fmt.Errorf("failed to read header: %v", err)
+	}
+	columns, err := findDatasetColumns(header)
+	if err != nil {
+		return nil, err
+	}
+	
+	// Read and parse each row into the column arrays
+	data := newHistoricalData(strings.Count(text, "\n"))
+	for {
+		row, err := reader.Read()
+		if err != nil {
+			break // End of file or error
+		}
+		md.appendDatasetRow(data, &columns, row)
 	}
 	
+	return data, nil
+}
+
+// datasetColumns holds the positions of the dataset columns in a CSV header
+type datasetColumns struct {
+	timestamp, price, volume, isAsk int
+	count                           int // Fields a row needs to hold all four
+}
+
+// findDatasetColumns locates the dataset columns in a CSV header
+func findDatasetColumns(header []string) (datasetColumns, error) {
 	// Find column indices
-	timestampIdx, priceIdx, volumeIdx, isAskIdx := -1, -1, -1, -1
+	columns := datasetColumns{timestamp: -1, price: -1, volume: -1, isAsk: -1}
 	for i, col := range header {
 		switch strings.ToLower(col) {
 		case "timestamp":
-			timestampIdx = i
+			columns.timestamp = i
 		case "price":
-			priceIdx = i
+			columns.price = i
 		case "volume":
-			volumeIdx = i
+			columns.volume = i
 		case "is_ask":
-			isAskIdx = i
+			columns.isAsk = i
 		}
 	}
 	
 	// Check if all required columns are found
-	if timestampIdx == -1 || priceIdx == -1 || volumeIdx == -1 || isAskIdx == -1 {
-		return fmt.Errorf("missing required columns in CSV file")
+	if columns.timestamp == -1 || columns.price == -1 || columns.volume == -1 || columns.isAsk == -1 {
+		return columns, fmt.Errorf("missing required columns in CSV file")
 	}
-	
-	// Read and process each row
-	lineCount := 0
-	for {
-		row, err := reader.Read()
-		if err != nil {
-			break // End of file or error
-		}
-		
-		// Parse values
-		timestamp, err := time.Parse(time.RFC3339, row[timestampIdx])
-		if err != nil {
-			md.logger.Warning(fmt.Sprintf("Invalid timestamp format: %s", row[timestampIdx]))
-			continue
+	for _, i := range [...]int{columns.timestamp, columns.price, columns.volume, columns.isAsk} {
+		if i >= columns.count {
+			columns.count = i + 1
 		}
-		
-		price, err := strconv.ParseFloat(row[priceIdx], 64)
-		if err != nil {
-			md.logger.Warning(fmt.Sprintf("Invalid price: %s", row[priceIdx]))
-			continue
-		}
-		
-		volume, err := strconv.ParseFloat(row[volumeIdx], 64)
-		if err != nil {
-			md.logger.Warning(fmt.Sprintf("Invalid volume: %s", row[volumeIdx]))
-			continue
-		}
-		
-		isAsk, err := strconv.ParseBool(row[isAskIdx])
-		if err != nil {
-			md.logger.Warning(fmt.Sprintf("Invalid is_ask value: %s", row[isAskIdx]))
-			continue
-		}
-		
-		// Create tick data
-		tick := &types.TickData{
-			Price:     price,
-			Volume:    volume,
-			IsAsk:     isAsk,
-			Timestamp: timestamp,
+	}
+	return columns, nil
+}
+
+// newHistoricalData creates an empty dataset with room for n ticks
+func newHistoricalData(n int) *types.HistoricalData {
+	return &types.HistoricalData{
+		Timestamps: make([]int64, 0, n),
+		Prices:     make([]float64, 0, n),
+		Volumes:    make([]float64, 0, n),
+		IsAsk:      make([]bool, 0, n),
+	}
+}
+
+// appendDatasetRow parses a CSV row and appends it to the column arrays. A
+// row that is short or holds an invalid value is skipped with a warning.
+func (md *MarketData) appendDatasetRow(data *types.HistoricalData, columns *datasetColumns, row []string) {
+	if len(row) < columns.count {
+		md.logger.Throttledf(md.rowWarnings, logger.WARNING, "Skipping row with %d fields", len(row))
+		return
+	}
+	
+	// Parse values
+	timestamp, err := parseTimestampMs(row[columns.timestamp])
+	if err != nil {
+		md.logger.Throttledf(md.rowWarnings, logger.WARNING, "Invalid timestamp format: %s", row[columns.timestamp])
+		return
+	}
+	
+	price, err := strconv.ParseFloat(row[columns.price], 64)
+	if err != nil {
+		md.logger.Throttledf(md.rowWarnings, logger.WARNING, "Invalid price: %s", row[columns.price])
+		return
+	}
+	
+	volume, err := strconv.ParseFloat(row[columns.volume], 64)
+	if err != nil {
+		md.logger.Throttledf(md.rowWarnings, logger.WARNING, "Invalid volume: %s", row[columns.volume])
+		return
+	}
+	
+	isAsk, err := strconv.ParseBool(row[columns.isAsk])
+	if err != nil {
+		md.logger.Throttledf(md.rowWarnings, logger.WARNING, "Invalid is_ask value: %s", row[columns.isAsk])
+		return
+	}
+	
+	data.Timestamps = append(data.Timestamps, timestamp)
+	data.Prices = append(data.Prices, price)
+	data.Volumes = append(data.Volumes, volume)
+	data.IsAsk = append(data.IsAsk, isAsk)
+}
+
+// nextLine splits text at its first line break, dropping the break and any
+// carriage return before it
+func nextLine(text string) (line, rest string) {
+	if end := strings.IndexByte(text, '\n'); end >= 0 {
+		line, rest = text[:end], text[end+1:]
+	} else {
+		line = text
+	}
+	return strings.TrimSuffix(line, "\r"), rest
+}
+
+// ReplayHistoricalData feeds a loaded dataset through AddTick in order.
+// Replay runs in chunks and stops early if Disconnect is called; after
+// Disconnect it does not start.
+func (md *MarketData) ReplayHistoricalData(data *types.HistoricalData) {
+	// A single tick is reused for every row. The callback consumes it
+	// synchronously and must not retain the pointer.
+	tick := &types.TickData{}
+	for start, n := 0, data.Len(); start < n && !md.stopped.Load(); start += replayChunkSize {
+		end := start + replayChunkSize
+		if end > n {
+			end = n
 		}
+		md.replayChunk(data, start, end, tick)
+	}
+}
+
+// replayChunk feeds ticks [start, end) through AddTick as fast as possible.
+// The columns are resliced to a common length up front so the loop body
+// indexes them without per-element bounds checks.
+func (md *MarketData) replayChunk(data *types.HistoricalData, start, end int, tick *types.TickData) {
+	prices := data.Prices[start:end]
+	n := len(prices)
+	volumes := data.Volumes[start:][:n]
+	isAsk := data.IsAsk[start:][:n]
+	timestamps := data.Timestamps[start:][:n]
+	
+	for i, price := range prices {
+		tick.Price = price
+		tick.Volume = volumes[i]
+		tick.IsAsk = isAsk[i]
+		tick.Timestamp = timestamps[i]
 		
-		// Add tick to market data
 		md.AddTick(tick)
-		lineCount++
+	}
+}
+
+// parseTimestampMs parses a CSV timestamp given either as epoch milliseconds
+// (the format written by the recorder) or as RFC3339. The digit scan decides
+// the format without building an error: a failed strconv.ParseInt would
+// allocate one, only to discard it, for every RFC3339 row.
+func parseTimestampMs(value string) (int64, error) {
+	if ms, ok := parseDigits([]byte(value)); ok {
+		return ms, nil
 	}
 	
-	md.logger.Info(fmt.Sprintf("Loaded %d historical data points", lineCount))
-	return nil
-}
\ No newline at end of file
+	t, err := time.Parse(time.RFC3339, value)
+	if err != nil {
+		return 0, err
+	}
+	return t.UnixMilli(), nil
+}
@@ -0,0 +1,60 @@
+package market
+
+import (
+	"testing"
+
+	"TRADE/pkg/logger"
+	"TRADE/pkg/types"
+)
+
+// replayDataset builds a dataset of n valid ticks one second apart
+func replayDataset(n int) *types.HistoricalData {
+	data := &types.HistoricalData{
+		Timestamps: make([]int64, n),
+		Prices:     make([]float64, n),
+		Volumes:    make([]float64, n),
+		IsAsk:      make([]bool, n),
+	}
+	for i := 0; i < n; i++ {
+		data.Timestamps[i] = 1700000000000 + int64(i)*1000
+		data.Prices[i] = 100 + float64(i%10)
+		data.Volumes[i] = 1
+		data.IsAsk[i] = i%2 == 0
+	}
+	return data
+}
+
+// TestReplayAfterDisconnect checks that a replay does not start once
+// Disconnect has been called, as happens when shutdown arrives while the
+// dataset is still loading
+func TestReplayAfterDisconnect(t *testing.T) {
+	md := NewMarketData(&logger.Logger{})
+	ticks := 0
+	md.SetTickCallback(func(tick *types.TickData) {
+		ticks++
+	})
+	
+	md.Disconnect()
+	md.ReplayHistoricalData(replayDataset(100))
+	if ticks != 0 {
+		t.Fatalf("replayed %d ticks after Disconnect, want 0", ticks)
+	}
+}
+
+// TestReplayStopsAtChunk checks that Disconnect during a replay stops it at
+// the end of the current chunk
+func TestReplayStopsAtChunk(t *testing.T) {
+	md := NewMarketData(&logger.Logger{})
+	ticks := 0
+	md.SetTickCallback(func(tick *types.TickData) {
+		ticks++
+		if ticks == 1 {
+			md.Disconnect()
+		}
+	})
+	
+	md.ReplayHistoricalData(replayDataset(3 * replayChunkSize))
+	if ticks != replayChunkSize {
+		t.Fatalf("replayed %d ticks, want one chunk of %d", ticks, replayChunkSize)
+	}
+}
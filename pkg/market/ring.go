@@ -0,0 +1,172 @@
+package market
+
+import (
+	"math"
+)
+
+// ring is a fixed-capacity history that overwrites its oldest entry once
+// full. Storage is allocated once, so pushing never allocates or shifts.
+type ring[T any] struct {
+	buf   []T
+	next  int // Index the next value is written to
+	count int
+}
+
+// newRing creates a ring holding up to size values
+func newRing[T any](size int) ring[T] {
+	return ring[T]{buf: make([]T, size)}
+}
+
+// push appends a value, dropping the oldest one if the ring is full
+func (r *ring[T]) push(value T) {
+	r.buf[r.next] = value
+	r.next++
+	if r.next == len(r.buf) {
+		r.next = 0
+	}
+	if r.count < len(r.buf) {
+		r.count++
+	}
+}
+
+// snapshot returns a copy of the values from oldest to newest
+func (r *ring[T]) snapshot() []T {
+	return chronological(r.buf, r.next, r.count)
+}
+
+// reset empties the ring without releasing its storage
+func (r *ring[T]) reset() {
+	r.next = 0
+	r.count = 0
+}
+
+// tickHistory holds the per-tick columns as parallel fixed-size arrays that
+// share one write index, so a tick is stored with a single index update and
+// every column of row i describes the same tick
+type tickHistory struct {
+	prices     []float64
+	volumes    []float64
+	highs      []float64
+	lows       []float64
+	timestamps []int64 // Milliseconds since epoch
+	next       int
+	count      int
+	invalid    int // Live rows with a NaN price or volume
+}
+
+// newTickHistory creates a history holding up to size ticks
+func newTickHistory(size int) tickHistory {
+	return tickHistory{
+		prices:     make([]float64, size),
+		volumes:    make([]float64, size),
+		highs:      make([]float64, size),
+		lows:       make([]float64, size),
+		timestamps: make([]int64, size),
+	}
+}
+
+// push stores a tick, carrying the running high and low forward from the
+// previous row
+func (h *tickHistory) push(price, volume float64, timestamp int64) {
+	high, low := price, price
+	if h.count > 0 {
+		prev := h.lastIndex()
+		high, low = compareHighLow(h.highs[prev], h.lows[prev], price)
+	}
+	
+	i := h.next
+	
+	// Track NaN rows as they enter and leave, so validity is known
+	// without scanning the window
+	if h.count == len(h.prices) && isInvalidRow(h.prices[i], h.volumes[i]) {
+		h.invalid--
+	}
+	if isInvalidRow(price, volume) {
+		h.invalid++
+	}
+	
+	h.prices[i] = price
+	h.volumes[i] = volume
+	h.highs[i] = high
+	h.lows[i] = low
+	h.timestamps[i] = timestamp
+	
+	h.next++
+	if h.next == len(h.prices) {
+		h.next = 0
+	}
+	if h.count < len(h.prices) {
+		h.count++
+	}
+}
+
+// isInvalidRow reports whether a row has a NaN price or volume
+func isInvalidRow(price, volume float64) bool {
+	return math.IsNaN(price) || math.IsNaN(volume)
+}
+
+// compareHighLow extends a running high/low pair with a new price. A NaN
+// price leaves the pair unchanged. It is kept small enough for the compiler
+// to inline into push.
+func compareHighLow(high, low, price float64) (float64, float64) {
+	if price > high {
+		high = price
+	}
+	if price < low {
+		low = price
+	}
+	return high, low
+}
+
+// lastIndex returns the row of the most recent tick; the history must not be empty
+func (h *tickHistory) lastIndex() int {
+	if h.next == 0 {
+		return len(h.prices) - 1
+	}
+	return h.next - 1
+}
+
+// len returns the number of ticks held
+func (h *tickHistory) len() int {
+	return h.count
+}
+
+// column returns a copy of one column from oldest to newest
+func (h *tickHistory) column(col []float64) []float64 {
+	return chronological(col, h.next, h.count)
+}
+
+// columnInto is column, copying into dst's storage when it is large enough
+func (h *tickHistory) columnInto(dst, col []float64) []float64 {
+	return chronologicalInto(dst, col, h.next, h.count)
+}
+
+// reset empties the history without releasing its storage
+func (h *tickHistory) reset() {
+	h.next = 0
+	h.count = 0
+	h.invalid = 0
+}
+
+// chronological copies the count live values of a ring buffer whose next
+// write index is next, from oldest to newest
+func chronological[T any](buf []T, next, count int) []T {
+	return chronologicalInto(nil, buf, next, count)
+}
+
+// chronologicalInto is chronological, copying into dst's storage when it
+// has room for count values and allocating only when it does not
+func chronologicalInto[T any](dst, buf []T, next, count int) []T {
+	result := dst[:0]
+	if cap(result) < count {
+		result = make([]T, count)
+	}
+	result = result[:count]
+	if count < len(buf) {
+		copy(result, buf[:count])
+		return result
+	}
+	n := copy(result, buf[next:])
+	copy(result[n:], buf[:next])
+	return result
+}
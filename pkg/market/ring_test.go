@@ -0,0 +1,28 @@
+package market
+
+import (
+	"math"
+	"testing"
+)
+
+// TestTickHistoryHighLowSkipsNaN checks that NaN rows, whatever their sign
+// bit, never become the running high or low
+func TestTickHistoryHighLowSkipsNaN(t *testing.T) {
+	negNaN := math.Copysign(math.NaN(), -1)
+	
+	prices := []float64{100, 105, negNaN, 95, math.NaN(), 110, math.Copysign(0, -1), 90}
+	h := newTickHistory(len(prices))
+	high, low := math.Inf(-1), math.Inf(1)
+	for i, price := range prices {
+		h.push(price, 1, int64(i))
+		
+		// The reference ignores NaN rows, as the comparisons do
+		if !math.IsNaN(price) {
+			high, low = math.Max(high, price), math.Min(low, price)
+		}
+		row := h.lastIndex()
+		if h.highs[row] != high || h.lows[row] != low {
+			t.Fatalf("after %v: high/low %v, %v, want %v, %v", price, h.highs[row], h.lows[row], high, low)
+		}
+	}
+}
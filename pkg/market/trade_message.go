@@ -0,0 +1,356 @@
+package market
+
+import (
+	"bytes"
+	"encoding/json"
+	"errors"
+	"strconv"
+)
+
+// tradeMessage is the subset of a Binance trade stream event used here.
+// encoding/json matches keys case-insensitively when there is no exact
+// match, so "t" and "M" get their own fields; otherwise they would be
+// decoded into TradeTime and IsMaker.
+type tradeMessage struct {
+	Symbol    string `json:"s"`
+	TradeID   int64  `json:"t"`
+	Price     float64 `json:"p,string"`
+	Quantity  float64 `json:"q,string"`
+	TradeTime int64  `json:"T"`
+	IsMaker   bool   `json:"m"`
+	Ignore    bool   `json:"M"`
+}
+
+// errIncompleteTrade rejects a trade event without a usable price, quantity
+// or trade time. It is allocated once, so rejecting a frame allocates nothing.
+var errIncompleteTrade = errors.New("trade event is missing price, quantity or time")
+
+// parseTradeMessage fills trade from a raw trade event, either bare or
+// wrapped in a combined-stream envelope ({"stream": ..., "data": {...}}).
+// The payload is scanned once, reading only the fields we use and decoding
+// price and quantity straight to float64; anything the scanner does not
+// handle (other nested values, escaped strings) falls back to
+// encoding/json. The symbol string of the previous message is reused when
+// the symbol is unchanged, so a steady stream does not allocate one per
+// trade; a message without a symbol gets none, as from encoding/json.
+func parseTradeMessage(data []byte, trade *tradeMessage) error {
+	symbol := trade.Symbol
+	*trade = tradeMessage{}
+	if scanTradeFields(data, symbol, trade) {
+		return validateTrade(trade)
+	}
+	
+	*trade = tradeMessage{}
+	var envelope struct {
+		Data json.RawMessage `json:"data"`
+	}
+	if err := json.Unmarshal(data, &envelope); err != nil {
+		return err
+	}
+	if envelope.Data != nil {
+		data = envelope.Data
+	}
+	if err := json.Unmarshal(data, trade); err != nil {
+		return err
+	}
+	return validateTrade(trade)
+}
+
+// validateTrade checks the fields every tick needs with a single test of the
+// parsed values. A missing field is left at zero and a NaN fails the
+// comparison, so neither can reach the market data.
+func validateTrade(trade *tradeMessage) error {
+	if trade.Price > 0 && trade.Quantity > 0 && trade.TradeTime > 0 {
+		return nil
+	}
+	return errIncompleteTrade
+}
+
+// scanTradeFields extracts s, p, q, T and m from a trade event in a single
+// pass, without allocating. It returns false if the input is not in the
+// expected shape or is anything encoding/json might read differently, so a
+// frame it accepts always decodes as it would through the fallback. trade
+// must be zero; symbol is reused for an equal symbol in the frame.
+func scanTradeFields(data []byte, symbol string, trade *tradeMessage) bool {
+	// Top-level fields go to outer. With a combined-stream envelope only
+	// the "data" payload counts, as for encoding/json, and it goes to trade.
+	var outer tradeMessage
+	payload := false
+	end, ok := scanTradeObject(data, skipSpace(data, 0), symbol, &outer, trade, &payload)
+	if !ok || skipSpace(data, end) != len(data) {
+		return false
+	}
+	if !payload {
+		*trade = outer
+	}
+	return true
+}
+
+// scanTradeObject scans the JSON object starting at data[i] into trade and
+// returns the index just past it. A "data" object member is scanned into
+// payload and flagged in sawPayload; with a nil payload it is rejected.
+func scanTradeObject(data []byte, i int, symbol string, trade, payload *tradeMessage, sawPayload *bool) (int, bool) {
+	if i >= len(data) || data[i] != '{' {
+		return i, false
+	}
+	i++
+	
+	for members := 0; ; members++ {
+		i = skipSpace(data, i)
+		if i >= len(data) {
+			return i, false
+		}
+		if data[i] == '}' {
+			return i + 1, true
+		}
+		
+		// Every member after the first follows a comma
+		if members > 0 {
+			if data[i] != ',' {
+				return i, false
+			}
+			i = skipSpace(data, i+1)
+		}
+		
+		// Key
+		key, next, ok := scanString(data, i)
+		if !ok {
+			return i, false
+		}
+		i = skipSpace(data, next)
+		if i >= len(data) || data[i] != ':' {
+			return i, false
+		}
+		i = skipSpace(data, i+1)
+		if i >= len(data) {
+			return i, false
+		}
+		
+		// encoding/json also matches keys case-insensitively, so a key
+		// that differs from a known one only in case is left to it
+		if len(key) == 4 && string(key) != "data" && bytes.EqualFold(key, []byte("data")) {
+			return i, false
+		}
+		if len(key) == 1 && (key[0] == 'S' || key[0] == 'P' || key[0] == 'Q') {
+			return i, false
+		}
+		
+		// Value: strings are returned without quotes, scalars verbatim
+		var value []byte
+		quoted := data[i] == '"'
+		switch data[i] {
+		case '"':
+			value, next, ok = scanString(data, i)
+			if !ok {
+				return i, false
+			}
+			i = next
+		case '{':
+			if string(key) != "data" || payload == nil || *sawPayload {
+				return i, false
+			}
+			i, ok = scanTradeObject(data, i, symbol, payload, nil, nil)
+			if !ok {
+				return i, false
+			}
+			*sawPayload = true
+			continue
+		case '[':
+			return i, false
+		default:
+			end := i
+			for end < len(data) && data[end] != ',' && data[end] != '}' && !isSpace(data[end]) {
+				end++
+			}
+			value = data[i:end]
+			i = end
+			if !isLiteral(value) {
+				return i, false
+			}
+		}
+		
+		if string(key) == "data" {
+			// A payload that is not an object is an error or no trade
+			return i, false
+		}
+		if len(key) != 1 {
+			continue
+		}
+		
+		// Price and quantity are strings, the other fields are not; any
+		// other shape goes to encoding/json, which rejects it. The trade ID
+		// and ignore flag are not used but are still type checked there.
+		switch key[0] {
+		case 's', 'p', 'q':
+			if !quoted {
+				return i, false
+			}
+		case 'T', 'm', 't', 'M':
+			if quoted {
+				return i, false
+			}
+		}
+		switch key[0] {
+		case 's':
+			if string(value) == symbol {
+				trade.Symbol = symbol
+			} else {
+				trade.Symbol = string(value)
+			}
+		case 'p':
+			if !isNumber(value) {
+				return i, false
+			}
+			price, err := strconv.ParseFloat(string(value), 64)
+			if err != nil {
+				return i, false
+			}
+			trade.Price = price
+		case 'q':
+			if !isNumber(value) {
+				return i, false
+			}
+			quantity, err := strconv.ParseFloat(string(value), 64)
+			if err != nil {
+				return i, false
+			}
+			trade.Quantity = quantity
+		case 'T':
+			ms, ok := parseDigits(value)
+			if !ok || !isNumber(value) {
+				return i, false
+			}
+			trade.TradeTime = ms
+		case 't':
+			if string(value) != "null" && !isInteger(value) {
+				return i, false
+			}
+		case 'M':
+			switch string(value) {
+			case "true", "false", "null":
+			default:
+				return i, false
+			}
+		case 'm':
+			switch string(value) {
+			case "true":
+				trade.IsMaker = true
+			case "false":
+				trade.IsMaker = false
+			default:
+				return i, false
+			}
+		}
+	}
+}
+
+// scanString returns the contents of the JSON string starting at data[i]
+// and the index just past its closing quote. Strings with escapes, control
+// characters or non-ASCII bytes are rejected.
+func scanString(data []byte, i int) ([]byte, int, bool) {
+	if i >= len(data) || data[i] != '"' {
+		return nil, i, false
+	}
+	end := bytes.IndexByte(data[i+1:], '"')
+	if end < 0 {
+		return nil, i, false
+	}
+	value := data[i+1 : i+1+end]
+	for _, c := range value {
+		if c < 0x20 || c == '\\' || c >= 0x80 {
+			return nil, i, false
+		}
+	}
+	return value, i + end + 2, true
+}
+
+// isLiteral reports whether value is a JSON number, true, false or null
+func isLiteral(value []byte) bool {
+	switch string(value) {
+	case "true", "false", "null":
+		return true
+	}
+	return isNumber(value)
+}
+
+// isNumber reports whether value follows the JSON number grammar
+func isNumber(value []byte) bool {
+	i := 0
+	if i < len(value) && value[i] == '-' {
+		i++
+	}
+	
+	// Integer part: a single zero or digits without a leading zero
+	if i < len(value) && value[i] == '0' {
+		i++
+	} else {
+		next := skipDigits(value, i)
+		if next == i {
+			return false
+		}
+		i = next
+	}
+	
+	if i < len(value) && value[i] == '.' {
+		next := skipDigits(value, i+1)
+		if next == i+1 {
+			return false
+		}
+		i = next
+	}
+	if i < len(value) && (value[i] == 'e' || value[i] == 'E') {
+		i++
+		if i < len(value) && (value[i] == '+' || value[i] == '-') {
+			i++
+		}
+		next := skipDigits(value, i)
+		if next == i {
+			return false
+		}
+		i = next
+	}
+	return i == len(value)
+}
+
+// isInteger reports whether value is a JSON number that parses as an int64
+func isInteger(value []byte) bool {
+	digits := bytes.TrimPrefix(value, []byte{'-'})
+	_, ok := parseDigits(digits)
+	return ok && isNumber(digits)
+}
+
+// skipDigits returns the index of the first non-digit at or after i
+func skipDigits(value []byte, i int) int {
+	for i < len(value) && value[i] >= '0' && value[i] <= '9' {
+		i++
+	}
+	return i
+}
+
+// parseDigits parses a non-negative decimal integer
+func parseDigits(value []byte) (int64, bool) {
+	if len(value) == 0 || len(value) > 18 {
+		return 0, false
+	}
+	var n int64
+	for _, c := range value {
+		if c < '0' || c > '9' {
+			return 0, false
+		}
+		n = n*10 + int64(c-'0')
+	}
+	return n, true
+}
+
+// skipSpace returns the index of the next non-whitespace byte
+func skipSpace(data []byte, i int) int {
+	for i < len(data) && isSpace(data[i]) {
+		i++
+	}
+	return i
+}
+
+// isSpace reports whether c is JSON whitespace
+func isSpace(c byte) bool {
+	return c == ' ' || c == '\t' || c == '\n' || c == '\r'
+}
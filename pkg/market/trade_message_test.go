@@ -0,0 +1,149 @@
+package market
+
+import (
+	"encoding/json"
+	"errors"
+	"testing"
+)
+
+// errMalformed marks a test case that neither decoder accepts
+var errMalformed = errors.New("malformed")
+
+// decodeTradeJSON is the reference decoder: encoding/json only, with the
+// same envelope handling and validation as parseTradeMessage
+func decodeTradeJSON(data []byte) (tradeMessage, error) {
+	var trade tradeMessage
+	var envelope struct {
+		Data json.RawMessage `json:"data"`
+	}
+	if err := json.Unmarshal(data, &envelope); err != nil {
+		return trade, err
+	}
+	if envelope.Data != nil {
+		data = envelope.Data
+	}
+	if err := json.Unmarshal(data, &trade); err != nil {
+		return trade, err
+	}
+	return trade, validateTrade(&trade)
+}
+
+// sameTradeFields compares the fields the scanner fills in
+func sameTradeFields(a, b *tradeMessage) bool {
+	return a.Symbol == b.Symbol &&
+		a.Price == b.Price &&
+		a.Quantity == b.Quantity &&
+		a.TradeTime == b.TradeTime &&
+		a.IsMaker == b.IsMaker
+}
+
+// tradeEvent is a complete bare trade event as Binance sends it
+const tradeEvent = `{"e":"trade","E":1700000000123,"s":"BTCUSDT","t":4242,"p":"37123.45","q":"0.0125","b":88,"a":99,"T":1700000000120,"m":true,"M":true}`
+
+// tradeMessageTests are decoded by both parseTradeMessage and encoding/json
+var tradeMessageTests = []struct {
+	name    string
+	data    string
+	scanned bool  // Handled by the scanner, without the fallback
+	err     error // Expected error; nil, errIncompleteTrade, or errMalformed
+}{
+	{"bare", tradeEvent, true, nil},
+	{"envelope", `{"stream":"btcusdt@trade","data":` + tradeEvent + `}`, true, nil},
+	{"envelope data first", `{"data":` + tradeEvent + `,"stream":"btcusdt@trade"}`, true, nil},
+	{"key order", `{"M":false,"m":false,"T":1700000000120,"q":"2","p":"100.5","t":7,"s":"ETHUSDT"}`, true, nil},
+	{"whitespace", "{ \"s\" : \"BTCUSDT\" ,\n\t\"p\":\"1.5\" , \"q\" : \"3\" , \"T\" : 17 , \"m\" : false }", true, nil},
+	{"t is not T", `{"s":"BTCUSDT","T":1700000000120,"p":"1","q":"1","t":1,"m":false}`, true, nil},
+	{"M is not m", `{"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false,"M":true}`, true, nil},
+	{"m after M", `{"s":"BTCUSDT","p":"1","q":"1","T":5,"M":false,"m":true}`, true, nil},
+	{"escaped symbol", `{"s":"BTC\u0055SDT","p":"1","q":"1","T":5,"m":false}`, false, nil},
+	{"escaped quote", `{"e":"tr\"ade","s":"BTCUSDT","p":"1","q":"1","T":5,"m":false}`, false, nil},
+	{"array member", `{"x":[1,2],"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false}`, false, nil},
+	{"trailing whitespace", tradeEvent + "\r\n", true, nil},
+	{"envelope ignores top level", `{"p":"5","data":{"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false}}`, true, nil},
+	{"folded key", `{"s":"BTCUSDT","P":"2","q":"1","T":5,"m":false}`, false, nil},
+	{"folded envelope", `{"Data":{"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false}}`, false, nil},
+	{"missing symbol", `{"p":"1","q":"1","T":5,"m":false}`, true, nil},
+	{"missing price", `{"s":"BTCUSDT","q":"1","T":5,"m":false}`, true, errIncompleteTrade},
+	{"missing quantity", `{"s":"BTCUSDT","p":"1","T":5,"m":false}`, true, errIncompleteTrade},
+	{"missing time", `{"s":"BTCUSDT","p":"1","q":"1","t":5,"m":false}`, true, errIncompleteTrade},
+	{"zero price", `{"s":"BTCUSDT","p":"0","q":"1","T":5,"m":false}`, true, errIncompleteTrade},
+	{"zero quantity", `{"s":"BTCUSDT","p":"1","q":"0.000","T":5,"m":false}`, true, errIncompleteTrade},
+	{"zero time", `{"s":"BTCUSDT","p":"1","q":"1","T":0,"m":false}`, true, errIncompleteTrade},
+	{"empty envelope data", `{"stream":"btcusdt@trade","data":{}}`, true, errIncompleteTrade},
+	{"truncated", `{"s":"BTCUSDT","p":"1","q":"1","T":5`, false, errMalformed},
+	{"bad price", `{"s":"BTCUSDT","p":"abc","q":"1","T":5,"m":false}`, false, errMalformed},
+	{"bad time", `{"s":"BTCUSDT","p":"1","q":"1","T":"5","m":false}`, false, errMalformed},
+	{"bad maker", `{"s":"BTCUSDT","p":"1","q":"1","T":5,"m":1}`, false, errMalformed},
+	{"quoted maker", `{"s":"BTCUSDT","p":"1","q":"1","T":5,"m":"true"}`, false, errMalformed},
+	{"unquoted price", `{"s":"BTCUSDT","p":1.5,"q":"1","T":5,"m":false}`, false, errMalformed},
+	{"unquoted symbol", `{"s":7,"p":"1","q":"1","T":5,"m":false}`, false, errMalformed},
+	{"trailing garbage", tradeEvent + `garbage`, false, errMalformed},
+	{"missing comma", `{"s":"BTCUSDT" "p":"1","q":"1","T":5,"m":false}`, false, errMalformed},
+	{"trailing comma", `{"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false,}`, false, errMalformed},
+	{"leading comma", `{,"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false}`, false, errMalformed},
+	{"two objects", tradeEvent + tradeEvent, false, errMalformed},
+	{"leading zero time", `{"s":"BTCUSDT","p":"1","q":"1","T":05,"m":false}`, false, errMalformed},
+	{"bad literal", `{"E":12abc,"s":"BTCUSDT","p":"1","q":"1","T":5,"m":false}`, false, errMalformed},
+	{"control character", "{\"s\":\"BTC\tUSDT\",\"p\":\"1\",\"q\":\"1\",\"T\":5,\"m\":false}", false, errMalformed},
+	{"envelope data null", `{"stream":"btcusdt@trade","data":null}`, false, errIncompleteTrade},
+	{"not an object", `[1,2,3]`, false, errMalformed},
+	{"empty", ``, false, errMalformed},
+}
+
+func TestParseTradeMessage(t *testing.T) {
+	for _, test := range tradeMessageTests {
+		t.Run(test.name, func(t *testing.T) {
+			data := []byte(test.data)
+			
+			var scanned tradeMessage
+			if ok := scanTradeFields(data, "", &scanned); ok != test.scanned {
+				t.Errorf("scanTradeFields = %v, want %v", ok, test.scanned)
+			}
+			
+			// The trade still holds the previous message, whose symbol
+			// must not carry over
+			got := tradeMessage{Symbol: "PREVUSDT", Price: 1, Quantity: 1, TradeTime: 1}
+			err := parseTradeMessage(data, &got)
+			want, wantErr := decodeTradeJSON(data)
+			switch test.err {
+			case nil:
+				if err != nil || wantErr != nil {
+					t.Fatalf("errors: got %v, encoding/json %v", err, wantErr)
+				}
+			case errMalformed:
+				if err == nil || errors.Is(err, errIncompleteTrade) || wantErr == nil {
+					t.Fatalf("errors: got %v, encoding/json %v, want a decoding error", err, wantErr)
+				}
+				return
+			default:
+				if !errors.Is(err, test.err) || !errors.Is(wantErr, test.err) {
+					t.Fatalf("errors: got %v, encoding/json %v, want %v", err, wantErr, test.err)
+				}
+			}
+			if !sameTradeFields(&got, &want) {
+				t.Errorf("got %+v, encoding/json %+v", got, want)
+			}
+		})
+	}
+}
+
+// FuzzScanTradeFields checks that any frame the scanner accepts decodes the
+// same way through encoding/json
+func FuzzScanTradeFields(f *testing.F) {
+	for _, test := range tradeMessageTests {
+		f.Add([]byte(test.data))
+	}
+	f.Fuzz(func(t *testing.T, data []byte) {
+		var got tradeMessage
+		if !scanTradeFields(data, "BTCUSDT", &got) {
+			return
+		}
+		want, err := decodeTradeJSON(data)
+		if err != nil && !errors.Is(err, errIncompleteTrade) {
+			t.Fatalf("scanner accepted %q, encoding/json: %v", data, err)
+		}
+		if !sameTradeFields(&got, &want) {
+			t.Fatalf("%q: got %+v, encoding/json %+v", data, got, want)
+		}
+	})
+}
@@ -0,0 +1,226 @@
+package storage
+
+import (
+	"fmt"
+	"os"
+	"path/filepath"
+	"strconv"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"TRADE/pkg/logger"
+	"TRADE/pkg/types"
+)
+
+// Recording writer parameters
+const (
+	recordQueueSize     = 8192        // Records waiting for the writer
+	recordBufferSize    = 64 * 1024   // Bytes collected before a file write
+	recordFlushInterval = time.Second // Longest a record waits before it is written
+)
+
+// DataStorage records live market data to disk. Records are queued for a
+// background writer, which batches them into large file writes, so recording
+// never puts file I/O on the market data path.
+type DataStorage struct {
+	dataDir string
+	raw     bool
+	logger  *logger.Logger
+	mutex   sync.Mutex
+	
+	// Queue to the writer; nil when not recording
+	queue      chan record
+	free       chan []byte // Frame buffers handed back by the writer for reuse
+	writerDone chan struct{}
+	dropped    atomic.Int64 // Records not written because the queue was full
+}
+
+// record is one queued tick, or frame for raw recordings
+type record struct {
+	tick  types.TickData
+	frame []byte
+}
+
+// NewDataStorage creates a recorder writing into dataDir
+func NewDataStorage(dataDir string, log *logger.Logger) *DataStorage {
+	return &DataStorage{
+		dataDir: dataDir,
+		logger:  log,
+	}
+}
+
+// StartRecording opens a new recording file for a symbol. Tick recordings
+// are CSV files in the format read back by backtests; raw recordings keep
+// each websocket frame as received, one per line, and are not parsed at all.
+func (ds *DataStorage) StartRecording(symbol string, raw bool) error {
+	ds.mutex.Lock()
+	defer ds.mutex.Unlock()
+	
+	if ds.queue != nil {
+		return fmt.Errorf("already recording")
+	}
+	
+	// Create data directory if it doesn't exist
+	if err := os.MkdirAll(ds.dataDir, 0755); err != nil {
+		return fmt.Errorf("failed to create data directory: %v", err)
+	}
+	
+	ext := ".csv"
+	if raw {
+		ext = ".jsonl"
+	}
+	name := fmt.Sprintf("%s_%s%s", strings.ToLower(symbol), time.Now().Format("20060102_150405"), ext)
+	filePath := filepath.Join(ds.dataDir, name)
+	
+	file, err := os.Create(filePath)
+	if err != nil {
+		return fmt.Errorf("failed to create recording file: %v", err)
+	}
+	
+	ds.raw = raw
+	ds.dropped.Store(0)
+	ds.queue = make(chan record, recordQueueSize)
+	ds.free = make(chan []byte, recordQueueSize)
+	ds.writerDone = make(chan struct{})
+	go ds.runWriter(file, raw, ds.queue, ds.free)
+	
+	ds.logger.Infof("Recording market data to %s", filePath)
+	return nil
+}
+
+// IsRaw reports whether the current recording stores raw frames
+func (ds *DataStorage) IsRaw() bool {
+	ds.mutex.Lock()
+	defer ds.mutex.Unlock()
+	return ds.raw
+}
+
+// RecordTick appends a tick to a CSV recording
+func (ds *DataStorage) RecordTick(tick *types.TickData) {
+	ds.mutex.Lock()
+	defer ds.mutex.Unlock()
+	
+	if ds.queue == nil || ds.raw {
+		return
+	}
+	ds.enqueue(record{tick: *tick})
+}
+
+// RecordRaw appends a websocket frame, as received, to a raw recording. The
+// frame is copied, so the caller may reuse it. Copies go into buffers the
+// writer has finished with, so a steady stream does not allocate per frame.
+func (ds *DataStorage) RecordRaw(frame []byte) {
+	ds.mutex.Lock()
+	defer ds.mutex.Unlock()
+	
+	if ds.queue == nil || !ds.raw {
+		return
+	}
+	
+	var buf []byte
+	select {
+	case buf = <-ds.free:
+	default:
+	}
+	ds.enqueue(record{frame: append(buf[:0], frame...)})
+}
+
+// enqueue hands a record to the writer; the caller holds the mutex. The
+// send never blocks: if the writer has fallen a full queue behind, the
+// record is dropped and counted.
+func (ds *DataStorage) enqueue(r record) {
+	select {
+	case ds.queue <- r:
+	default:
+		ds.dropped.Add(1)
+	}
+}
+
+// runWriter writes queued records until the queue is closed, returning frame
+// buffers on free once written. Records are formatted straight into one
+// output buffer, which goes to the file in a single write once it holds
+// recordBufferSize bytes, and at least every recordFlushInterval.
+func (ds *DataStorage) runWriter(file *os.File, raw bool, queue <-chan record, free chan<- []byte) {
+	defer close(ds.writerDone)
+	defer file.Close()
+	
+	ticker := time.NewTicker(recordFlushInterval)
+	defer ticker.Stop()
+	
+	out := make([]byte, 0, recordBufferSize+recordBufferSize/4)
+	if !raw {
+		out = append(out, tickHeader...)
+	}
+	flush := func() {
+		if _, err := file.Write(out); err != nil {
+			ds.logger.Errorf("Failed to flush recording: %v", err)
+		}
+		out = out[:0]
+	}
+	
+	for {
+		select {
+		case r, ok := <-queue:
+			if !ok {
+				flush()
+				return
+			}
+			if !raw {
+				out = appendTickRow(out, &r.tick)
+			} else {
+				out = append(out, r.frame...)
+				out = append(out, '\n')
+				select {
+				case free <- r.frame:
+				default:
+				}
+			}
+			if len(out) >= recordBufferSize {
+				flush()
+			}
+		case <-ticker.C:
+			if len(out) > 0 {
+				flush()
+			}
+		}
+	}
+}
+
+// tickHeader is the first line of a CSV recording
+const tickHeader = "timestamp,price,volume,is_ask\n"
+
+// appendTickRow appends a tick as a CSV recording line. Every column is a
+// number or a bool, so nothing ever needs quoting and the row is formatted
+// directly, without a csv.Writer or per-field strings.
+func appendTickRow(row []byte, tick *types.TickData) []byte {
+	row = strconv.AppendInt(row, tick.Timestamp, 10)
+	row = append(row, ',')
+	row = strconv.AppendFloat(row, tick.Price, 'f', -1, 64)
+	row = append(row, ',')
+	row = strconv.AppendFloat(row, tick.Volume, 'g', -1, 64)
+	row = append(row, ',')
+	row = strconv.AppendBool(row, tick.IsAsk)
+	return append(row, '\n')
+}
+
+// StopRecording writes out queued records and closes the current recording
+func (ds *DataStorage) StopRecording() {
+	ds.mutex.Lock()
+	queue, done := ds.queue, ds.writerDone
+	ds.queue = nil
+	ds.free = nil
+	ds.raw = false
+	ds.mutex.Unlock()
+	
+	if queue == nil {
+		return
+	}
+	close(queue)
+	<-done
+	
+	if dropped := ds.dropped.Load(); dropped > 0 {
+		ds.logger.Warningf("Recording is missing %d records: write queue was full", dropped)
+	}
+}
@@ -0,0 +1,93 @@
+package strategy
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"sync"
+	"time"
+)
+
+// thresholdsFile is the JSON layout of an entry thresholds file. Keys that
+// are left out keep their default value.
+type thresholdsFile struct {
+	VolatilityHi          *float64 `json:"volatility_hi"`
+	VolatilityLo          *float64 `json:"volatility_lo"`
+	RelativeStrengthHi    *float64 `json:"relative_strength_hi"`
+	RelativeStrengthLo    *float64 `json:"relative_strength_lo"`
+	TrendStrength         *float64 `json:"trend_strength"`
+	AvgTrendStrength      *float64 `json:"avg_trend_strength"`
+	OrderImbalance        *float64 `json:"order_imbalance"`
+	MarketEfficiencyRatio *float64 `json:"market_efficiency_ratio"`
+}
+
+// cachedThresholds is a parsed thresholds file and the file version it
+// was parsed from
+type cachedThresholds struct {
+	modTime    time.Time
+	size       int64
+	thresholds BuyThresholds
+}
+
+// thresholdsCache memoizes LoadBuyThresholds by path
+var thresholdsCache = struct {
+	entries map[string]cachedThresholds
+	mutex   sync.Mutex
+}{entries: make(map[string]cachedThresholds)}
+
+// LoadBuyThresholds reads entry thresholds from a JSON file, starting from
+// DefaultBuyThresholds. The parsed result is cached against the file's
+// modification time and size, so repeated loads of an unchanged file (e.g.
+// once per backtest run, or a periodic check for edits) cost one stat, while
+// an edited file is parsed again.
+func LoadBuyThresholds(path string) (BuyThresholds, error) {
+	info, err := os.Stat(path)
+	if err != nil {
+		return BuyThresholds{}, fmt.Errorf("failed to read config file: %v", err)
+	}
+	
+	thresholdsCache.mutex.Lock()
+	cached, ok := thresholdsCache.entries[path]
+	thresholdsCache.mutex.Unlock()
+	if ok && cached.modTime.Equal(info.ModTime()) && cached.size == info.Size() {
+		return cached.thresholds, nil
+	}
+	
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return BuyThresholds{}, fmt.Errorf("failed to read config file: %v", err)
+	}
+	var file thresholdsFile
+	if err := json.Unmarshal(data, &file); err != nil {
+		return BuyThresholds{}, fmt.Errorf("failed to parse config file: %v", err)
+	}
+	thresholds := file.apply(DefaultBuyThresholds())
+	
+	thresholdsCache.mutex.Lock()
+	thresholdsCache.entries[path] = cachedThresholds{
+		modTime:    info.ModTime(),
+		size:       info.Size(),
+		thresholds: thresholds,
+	}
+	thresholdsCache.mutex.Unlock()
+	
+	return thresholds, nil
+}
+
+// apply overrides the thresholds set in the file
+func (f *thresholdsFile) apply(t BuyThresholds) BuyThresholds {
+	set := func(dst *float64, src *float64) {
+		if src != nil {
+			*dst = *src
+		}
+	}
+	set(&t.VolatilityHi, f.VolatilityHi)
+	set(&t.VolatilityLo, f.VolatilityLo)
+	set(&t.RelativeStrengthHi, f.RelativeStrengthHi)
+	set(&t.RelativeStrengthLo, f.RelativeStrengthLo)
+	set(&t.TrendStrength, f.TrendStrength)
+	set(&t.AvgTrendStrength, f.AvgTrendStrength)
+	set(&t.OrderImbalance, f.OrderImbalance)
+	set(&t.MarketEfficiencyRatio, f.MarketEfficiencyRatio)
+	return t
+}
@@ -1,7 +1,9 @@
 package strategy
 
 import (
+	"math"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"TRADE/pkg/analyzer"
@@ -9,49 +11,204 @@ import (
 	"TRADE/pkg/types"
 )
 
-// Strategy generates trading signals based on market conditions
+// BuyThresholds holds the entry condition thresholds
+type BuyThresholds struct {
+	VolatilityHi          float64
+	VolatilityLo          float64
+	RelativeStrengthHi    float64
+	RelativeStrengthLo    float64
+	TrendStrength         float64
+	AvgTrendStrength      float64
+	OrderImbalance        float64
+	MarketEfficiencyRatio float64
+}
+
+// DefaultBuyThresholds returns the standard entry thresholds
+func DefaultBuyThresholds() BuyThresholds {
+	return BuyThresholds{
+		VolatilityHi:          0.70,
+		VolatilityLo:          0.35,
+		RelativeStrengthHi:    0.75,
+		RelativeStrengthLo:    0.25,
+		TrendStrength:         5.0,
+		AvgTrendStrength:      3.0,
+		OrderImbalance:        0.65,
+		MarketEfficiencyRatio: 0.93,
+	}
+}
+
+// BuyPredicate reports whether a metrics snapshot meets the entry conditions.
+// It takes the snapshot by value: a pointer passed through a function value
+// would always be treated as escaping, forcing every tick's snapshot onto
+// the heap.
+type BuyPredicate func(metrics types.MarketMetrics) bool
+
+// Predicate builds the entry predicate specialised for these thresholds.
+// The values are captured by the closure, so evaluating it never goes back
+// through the Strategy or the thresholds struct.
+func (t BuyThresholds) Predicate() BuyPredicate {
+	volHi, volLo := t.VolatilityHi, t.VolatilityLo
+	rsHi, rsLo := t.RelativeStrengthHi, t.RelativeStrengthLo
+	trend, avgTrend := t.TrendStrength, t.AvgTrendStrength
+	orderImb, mer := t.OrderImbalance, t.MarketEfficiencyRatio
+	
+	return func(metrics types.MarketMetrics) bool {
+		// Conditions are ordered from least to most likely to hold on a typical
+		// tick (measured over the recorded BTCUSDT datasets), so the common
+		// no-signal case short-circuits after one or two comparisons
+		return metrics.TrendStrength >= trend &&
+			metrics.RealizedVolatility >= volLo &&
+			metrics.RealizedVolatility <= volHi &&
+			metrics.AvgTrendStrength >= avgTrend &&
+			metrics.OrderImbalance >= orderImb &&
+			metrics.TrendStrength > metrics.AvgTrendStrength &&
+			metrics.RelativeStrength >= rsLo &&
+			metrics.RelativeStrength <= rsHi &&
+			metrics.MarketEfficiencyRatio >= mer
+	}
+}
+
+// Exit condition parameters
+const (
+	trailingStopActivation = 1.0           // Percentage gain to activate trailing stop
+	profitTargetMultiplier = 2.5           // Profit target as multiple of risk
+	trailingStopDistance   = 1.5           // Trailing stop distance factor
+	trendStrengthThreshold = -7.0          // Trend strength threshold for exit
+	minProfit              = 0.3           // Minimum profit percentage for time-based exit
+	maxTradeDuration       = 4 * time.Hour // Time-based exit horizon
+	minATRFraction         = 0.001         // Floor on the ATR used for exit levels, as a fraction of price
+	maxTradeDurationMs     = int64(maxTradeDuration / time.Millisecond) // Same horizon, for integer time arithmetic
+)
+
+// Exit thresholds derived at compile time, so per-tick checks use them directly
+const (
+	activationThreshold = trailingStopActivation / 100                  // Fraction of entry price
+	minProfitThreshold  = minProfit / 100                               // Fraction of entry price
+	profitTargetATR     = trailingStopDistance * profitTargetMultiplier // Profit target distance in ATRs
+)
+
+// warningsPerSecond caps how often a repeated warning is logged
+const warningsPerSecond = 10
+
+// entryRules pairs the entry thresholds with their compiled predicate. It is
+// replaced as a whole and never modified, so it can be read without locking.
+type entryRules struct {
+	thresholds BuyThresholds
+	check      BuyPredicate
+}
+
+// newEntryRules compiles a set of entry thresholds
+func newEntryRules(thresholds BuyThresholds) *entryRules {
+	return &entryRules{
+		thresholds: thresholds,
+		check:      thresholds.Predicate(),
+	}
+}
+
+// Strategy generates trading signals based on market conditions.
+// Signal generation is the only writer of the trade state and holds the
+// mutex; the per-tick readers (IsActiveTrade, NeedsFullMetrics) read the
+// active flag and entry rules atomically instead.
 type Strategy struct {
 	analyzer       *analyzer.Analyzer
 	logger         *logger.Logger
-	activeTrade    *types.TradeData
+	activeTrade    types.TradeData // Held inline to avoid a pointer hop per access
+	invEntryPrice  float64 // 1/EntryPrice of the active trade
+	timeExitAtMs   int64   // TimeExitAt of the active trade, in ms since epoch
+	active         atomic.Bool // Mirrors activeTrade.Active
+	rules          atomic.Pointer[entryRules]
+	inputWarnings  *logger.RateLimit // Throttles the invalid input warning
 	mutex          sync.RWMutex
 }
 
 // NewStrategy creates a new trading strategy
 func NewStrategy(analyzer *analyzer.Analyzer, log *logger.Logger) *Strategy {
-	return &Strategy{
-		analyzer:    analyzer,
-		logger:      log,
-		activeTrade: types.NewTradeData(),
+	s := &Strategy{
+		analyzer:      analyzer,
+		logger:        log,
+		activeTrade:   *types.NewTradeData(),
+		inputWarnings: logger.NewRateLimit(warningsPerSecond, warningsPerSecond),
+	}
+	s.rules.Store(newEntryRules(DefaultBuyThresholds()))
+	return s
+}
+
+// SetBuyThresholds replaces the entry thresholds used for new signals
+func (s *Strategy) SetBuyThresholds(thresholds BuyThresholds) {
+	s.rules.Store(newEntryRules(thresholds))
+}
+
+// GetBuyThresholds returns the entry thresholds in use
+func (s *Strategy) GetBuyThresholds() BuyThresholds {
+	return s.rules.Load().thresholds
+}
+
+// NeedsFullMetrics reports whether the remaining metrics must be calculated
+// once a tick's trend metrics are known. Without an active trade, a tick
+// that already fails the trend conditions cannot produce a signal.
+func (s *Strategy) NeedsFullMetrics(trendStrength, avgTrendStrength float64) bool {
+	if s.active.Load() {
+		return true
 	}
+	
+	thresholds := &s.rules.Load().thresholds
+	return trendStrength >= thresholds.TrendStrength &&
+		avgTrendStrength >= thresholds.AvgTrendStrength &&
+		trendStrength > avgTrendStrength
 }
 
-// GenerateSignal generates trading signals based on market conditions
-func (s *Strategy) GenerateSignal(price float64, timestamp time.Time, metrics *types.MarketMetrics) *types.Signal {
+// GenerateSignal generates trading signals based on market conditions.
+// timestampMs is the tick time in milliseconds since epoch; a time.Time is
+// only built for a tick that produces a signal.
+func (s *Strategy) GenerateSignal(price float64, timestampMs int64, metrics *types.MarketMetrics) *types.Signal {
+	// Validate inputs once here so the entry/exit checks below can assume
+	// well-formed data and stay free of defensive branches
+	if !validInput(price, metrics) {
+		s.logger.Throttledf(s.inputWarnings, logger.WARNING, "Skipping signal generation: invalid input (price %.6f)", price)
+		return nil
+	}
+	
 	s.mutex.Lock()
 	defer s.mutex.Unlock()
 	
 	// Check if we have an active trade
 	if s.activeTrade.Active {
-		return s.checkExitConditions(price, timestamp, metrics)
+		return s.checkExitConditions(price, timestampMs, metrics)
 	} else {
-		return s.checkEntryConditions(price, timestamp, metrics)
+		return s.checkEntryConditions(price, timestampMs, metrics)
 	}
 }
 
+// validInput reports whether a tick can be evaluated: the price is positive
+// and the metrics the exit arithmetic depends on are numbers. A NaN ATR or
+// trend strength would make every stop comparison false and silently hold
+// the trade, so it is rejected here rather than checked inside the exit math.
+func validInput(price float64, metrics *types.MarketMetrics) bool {
+	return metrics != nil && price > 0 &&
+		!math.IsNaN(metrics.ATR) && !math.IsNaN(metrics.TrendStrength)
+}
+
 // checkEntryConditions checks for entry conditions based on market metrics
-func (s *Strategy) checkEntryConditions(price float64, timestamp time.Time, metrics *types.MarketMetrics) *types.Signal {
+func (s *Strategy) checkEntryConditions(price float64, timestampMs int64, metrics *types.MarketMetrics) *types.Signal {
 	// Check buy conditions
 	if s.checkBuyConditions(metrics) {
 		s.logger.Info("Buy conditions met")
+		timestamp := time.UnixMilli(timestampMs)
 		
-		// Create active trade
-		s.activeTrade.Active = true
-		s.activeTrade.Direction = "buy"
-		s.activeTrade.EntryPrice = price
-		s.activeTrade.EntryTime = timestamp
-		s.activeTrade.HighestPrice = price
-		s.activeTrade.LowestPrice = price
+		// Create active trade in one struct store, which also clears the
+		// stop level and PnL left over from the previous trade
+		s.activeTrade = types.TradeData{
+			Active:       true,
+			Direction:    types.SideBuy,
+			EntryPrice:   price,
+			EntryTime:    timestamp,
+			TimeExitAt:   timestamp.Add(maxTradeDuration),
+			HighestPrice: price,
+			LowestPrice:  price,
+		}
+		s.invEntryPrice = 1 / price
+		s.timeExitAtMs = timestampMs + maxTradeDurationMs
+		s.active.Store(true)
 		
 		// Generate buy signal
 		return types.NewBuySignal(price, timestamp, metrics)
@@ -61,33 +218,41 @@ func (s *Strategy) checkEntryConditions(price float64, timestamp time.Time, metr
 }
 
 // checkExitConditions checks for exit conditions for an active trade
-func (s *Strategy) checkExitConditions(price float64, timestamp time.Time, metrics *types.MarketMetrics) *types.Signal {
-	// Update highest and lowest prices
-	if price > s.activeTrade.HighestPrice {
-		s.activeTrade.HighestPrice = price
-	}
-	if price < s.activeTrade.LowestPrice {
-		s.activeTrade.LowestPrice = price
+func (s *Strategy) checkExitConditions(price float64, timestampMs int64, metrics *types.MarketMetrics) *types.Signal {
+	trade := &s.activeTrade
+	
+	// Update highest and lowest prices (a tick can only extend one side)
+	if price > trade.HighestPrice {
+		trade.HighestPrice = price
+	} else if price < trade.LowestPrice {
+		trade.LowestPrice = price
 	}
 	
 	// Check sell conditions
-	stopTriggered, reason, stopLoss, profit := s.checkSellConditions(
-		s.activeTrade.EntryTime,
-		s.activeTrade.EntryPrice,
-		s.activeTrade.HighestPrice,
+	result := checkSellConditions(
+		s.timeExitAtMs,
+		s.invEntryPrice,
+		trade.HighestPrice,
 		price,
-		timestamp,
-		metrics,
+		timestampMs,
+		metrics.ATR,
+		metrics.TrendStrength,
 	)
 	
-	if stopTriggered {
-		s.logger.Info("Sell conditions met: " + reason)
-		
-		// Generate sell signal
-		signal := types.NewSellSignal(price, timestamp, reason, profit*100, stopLoss)
+	// Keep the latest stop level on the trade itself. The level check comes
+	// first: boxing the arguments would allocate even when debug output is off
+	trade.StopLoss = result.stopLoss
+	if result.trailed && s.logger.IsEnabled(logger.DEBUG) {
+		s.logger.Debugf("Trailing stop updated to %.6f (profit: %.2f%%)", result.stopLoss, result.profit*100)
+	}
+	
+	if result.triggered() {
+		// Generate sell signal; it is logged once, by whoever acts on it
+		signal := types.NewSellSignal(price, time.UnixMilli(timestampMs), result.reason, result.profit*100, result.stopLoss, trade)
 		
 		// Reset active trade
-		s.activeTrade.Active = false
+		trade.Active = false
+		s.active.Store(false)
 		
 		return signal
 	}
@@ -97,61 +262,83 @@ func (s *Strategy) checkExitConditions(price float64, timestamp time.Time, metri
 
 // checkBuyConditions checks if buy conditions are met
 func (s *Strategy) checkBuyConditions(metrics *types.MarketMetrics) bool {
-	// Default thresholds
-	thresholds := map[string]float64{
-		"realized_volatility_hi": 0.70,
-		"realized_volatility_lo": 0.35,
-		"relative_strength_hi":   0.75,
-		"relative_strength_lo":   0.25,
-		"trend_strength":         5.0,
-		"avg_trend_strength":     3.0,
-		"order_imbalance":        0.65,
-		"market_efficiency_ratio": 0.93,
-	}
-	
-	// Check all conditions
-	return (
-		metrics.RealizedVolatility <= thresholds["realized_volatility_hi"] &&
-		metrics.RealizedVolatility >= thresholds["realized_volatility_lo"] &&
-		metrics.RelativeStrength <= thresholds["relative_strength_hi"] &&
-		metrics.RelativeStrength >= thresholds["relative_strength_lo"] &&
-		metrics.TrendStrength >= thresholds["trend_strength"] &&
-		metrics.AvgTrendStrength >= thresholds["avg_trend_strength"] &&
-		metrics.TrendStrength > metrics.AvgTrendStrength &&
-		metrics.OrderImbalance >= thresholds["order_imbalance"] &&
-		metrics.MarketEfficiencyRatio >= thresholds["market_efficiency_ratio"]
-	)
+	return s.rules.Load().check(*metrics)
+}
+
+// EvaluateBuyGrid evaluates one metrics snapshot against a grid of entry
+// thresholds (e.g. a parameter search), setting out[i] if grid[i] would open
+// a trade. The metric values are loaded once and the threshold-independent
+// condition is checked up front, so each grid entry costs only its
+// comparisons. out must be at least len(grid) long.
+func EvaluateBuyGrid(metrics *types.MarketMetrics, grid []BuyThresholds, out []bool) {
+	out = out[:len(grid)]
+	if !(metrics.TrendStrength > metrics.AvgTrendStrength) {
+		for i := range out {
+			out[i] = false
+		}
+		return
+	}
+	
+	vol := metrics.RealizedVolatility
+	rs := metrics.RelativeStrength
+	trend := metrics.TrendStrength
+	avgTrend := metrics.AvgTrendStrength
+	orderImb := metrics.OrderImbalance
+	mer := metrics.MarketEfficiencyRatio
+	for i := range grid {
+		t := &grid[i]
+		out[i] = trend >= t.TrendStrength &&
+			vol >= t.VolatilityLo &&
+			vol <= t.VolatilityHi &&
+			avgTrend >= t.AvgTrendStrength &&
+			orderImb >= t.OrderImbalance &&
+			rs >= t.RelativeStrengthLo &&
+			rs <= t.RelativeStrengthHi &&
+			mer >= t.MarketEfficiencyRatio
+	}
+}
+
+// sellResult is the outcome of one sell check
+type sellResult struct {
+	reason   types.ExitReason // ExitNone to hold the trade
+	stopLoss float64          // Current stop level
+	profit   float64          // Profit as a fraction of the entry price
+	trailed  bool             // The trailing stop raised the stop level
 }
 
-// checkSellConditions checks if sell conditions are met
-func (s *Strategy) checkSellConditions(
-	entryTime time.Time,
-	entryPrice float64,
+// triggered reports whether the trade should be closed
+func (r *sellResult) triggered() bool {
+	return r.reason != types.ExitNone
+}
+
+// checkSellConditions checks if sell conditions are met. It is a pure
+// function of its scalar arguments, with no strategy state, logging or
+// strings (the exit reason is an integer code), so the compiler can keep
+// it to straight-line float code. Times are milliseconds since epoch, so
+// the deadline check is an integer compare. The result is returned by
+// value, so nothing is allocated.
+func checkSellConditions(
+	timeExitAtMs int64,
+	invEntryPrice float64,
 	highestPrice float64,
 	currentPrice float64,
-	timestamp time.Time,
-	metrics *types.MarketMetrics,
-) (bool, string, float64, float64) {
-	// Constants for exit conditions
-	trailingStopActivation := 1.0  // Percentage gain to activate trailing stop
-	profitTargetMultiplier := 2.5  // Profit target as multiple of risk
-	trailingStopDistance := 1.5    // Trailing stop distance factor
-	trendStrengthThreshold := -7.0 // Trend strength threshold for exit
-	minProfit := 0.3               // Minimum profit percentage for time-based exit
-	
+	timestampMs int64,
+	atr float64,
+	trendStrength float64,
+) sellResult {
 	// Calculate current profit percentage
-	profit := (currentPrice / entryPrice - 1)
-	stopTriggered := false
-	reason := ""
+	profit := currentPrice*invEntryPrice - 1
+	reason := types.ExitNone
+	trailed := false
 	
 	// Calculate stop loss and take profit levels
-	atr := metrics.ATR
-	if atr < currentPrice*0.001 {
-		atr = currentPrice * 0.001 // Use minimum 0.1% ATR
+	rangeATR := atr
+	if minATR := currentPrice * minATRFraction; rangeATR < minATR {
+		rangeATR = minATR // Use minimum 0.1% ATR
 	}
 	
-	stopDistance := trailingStopDistance * atr
-	profitDistance := stopDistance * profitTargetMultiplier
+	stopDistance := trailingStopDistance * rangeATR
+	profitDistance := profitTargetATR * rangeATR
 	
 	// For long trades: stop below entry, target above entry
 	stopLoss := currentPrice - stopDistance
@@ -159,53 +346,51 @@ func (s *Strategy) checkSellConditions(
 	
 	// Check stop loss
 	if currentPrice <= stopLoss {
-		stopTriggered = true
-		reason = "stop_loss"
+		reason = types.ExitStopLoss
 	}
 	
 	// Check take profit
 	if currentPrice >= takeProfit {
-		stopTriggered = true
-		reason = "take_profit"
+		reason = types.ExitTakeProfit
 	}
 	
 	// Adjust trailing stop if profit exceeds activation threshold
-	activationThreshold := trailingStopActivation / 100
 	if profit >= activationThreshold {
-		// Calculate trailing stop level
-		trailDistance := trailingStopActivation * (metrics.ATR / highestPrice)
-		trailLevel := highestPrice * (1 - trailDistance)
+		// Calculate trailing stop level, i.e. highest * (1 - act*ATR/highest)
+		trailLevel := highestPrice - trailingStopActivation*atr
 		
 		// Update stop loss if trailing stop is higher
 		if trailLevel > stopLoss {
 			stopLoss = trailLevel
-			s.logger.Info("Trailing stop updated")
+			trailed = true
 		}
 	}
 	
-	// Check time-based exit
-	if !entryTime.IsZero() {
-		tradeDuration := timestamp.Sub(entryTime).Hours()
-		if tradeDuration > 4 && profit >= minProfit/100 {  // Exit after 4 hours
-			stopTriggered = true
-			reason = "time_exit"
+	// The time and trend exits share one condition: the trade must be in
+	// enough profit. Trend reversal takes precedence when both apply.
+	if profit >= minProfitThreshold {
+		// Check time-based exit (deadline is fixed when the trade is opened)
+		if timestampMs > timeExitAtMs {
+			reason = types.ExitTimeLimit
+		}
+		
+		// Check trend reversal exit
+		if trendStrength < trendStrengthThreshold {
+			reason = types.ExitTrendReversal
 		}
 	}
 	
-	// Check trend reversal exit
-	if metrics.TrendStrength < trendStrengthThreshold && profit >= minProfit/100 {
-		stopTriggered = true
-		reason = "trend_reversal"
+	return sellResult{
+		reason:   reason,
+		stopLoss: stopLoss,
+		profit:   profit,
+		trailed:  trailed,
 	}
-	
-	return stopTriggered, reason, stopLoss, profit
 }
 
 // IsActiveTrade returns whether there is an active trade
 func (s *Strategy) IsActiveTrade() bool {
-	s.mutex.RLock()
-	defer s.mutex.RUnlock()
-	return s.activeTrade.Active
+	return s.active.Load()
 }
 
 // GetActiveTradeData returns data about the active trade
@@ -213,24 +398,18 @@ func (s *Strategy) GetActiveTradeData() *types.TradeData {
 	s.mutex.RLock()
 	defer s.mutex.RUnlock()
 	
-	// Create a copy of the active trade data
-	tradeCopy := &types.TradeData{
-		Active:       s.activeTrade.Active,
-		Direction:    s.activeTrade.Direction,
-		EntryPrice:   s.activeTrade.EntryPrice,
-		EntryTime:    s.activeTrade.EntryTime,
-		HighestPrice: s.activeTrade.HighestPrice,
-		LowestPrice:  s.activeTrade.LowestPrice,
-		StopLoss:     s.activeTrade.StopLoss,
-	}
+	// Copy the active trade data in one assignment
+	tradeCopy := s.activeTrade
 	
 	// Calculate current PnL if active
 	if tradeCopy.Active {
-		currentPrice := s.activeTrade.HighestPrice // Use highest price as a proxy for current price
-		tradeCopy.CurrentPnL = (currentPrice / s.activeTrade.EntryPrice - 1) * 100
+		currentPrice := tradeCopy.HighestPrice // Use highest price as a proxy for current price
+		tradeCopy.CurrentPnL = (currentPrice*s.invEntryPrice - 1) * 100
+	} else {
+		tradeCopy.CurrentPnL = 0
 	}
 	
-	return tradeCopy
+	return &tradeCopy
 }
 
 // UpdateStopLoss updates the stop loss level for the active trade
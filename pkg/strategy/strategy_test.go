@@ -0,0 +1,70 @@
+package strategy
+
+import (
+	"math"
+	"math/rand"
+	"testing"
+
+	"TRADE/pkg/types"
+)
+
+// TestEvaluateBuyGridMatchesPredicate checks every grid entry against the
+// single-threshold predicate over random snapshots near the thresholds
+func TestEvaluateBuyGridMatchesPredicate(t *testing.T) {
+	rng := rand.New(rand.NewSource(1))
+	def := DefaultBuyThresholds()
+	
+	// around scales v by a random factor in [0.5, 1.5)
+	around := func(v float64) float64 {
+		return v * (0.5 + rng.Float64())
+	}
+	
+	grid := make([]BuyThresholds, 32)
+	grid[0] = def
+	for i := 1; i < len(grid); i++ {
+		grid[i] = BuyThresholds{
+			VolatilityHi:          around(def.VolatilityHi),
+			VolatilityLo:          around(def.VolatilityLo),
+			RelativeStrengthHi:    around(def.RelativeStrengthHi),
+			RelativeStrengthLo:    around(def.RelativeStrengthLo),
+			TrendStrength:         around(def.TrendStrength),
+			AvgTrendStrength:      around(def.AvgTrendStrength),
+			OrderImbalance:        around(def.OrderImbalance),
+			MarketEfficiencyRatio: around(def.MarketEfficiencyRatio),
+		}
+	}
+	predicates := make([]BuyPredicate, len(grid))
+	for i := range grid {
+		predicates[i] = grid[i].Predicate()
+	}
+	
+	out := make([]bool, len(grid))
+	buys := 0
+	for n := 0; n < 5000; n++ {
+		metrics := types.MarketMetrics{
+			RealizedVolatility:    around((def.VolatilityLo + def.VolatilityHi) / 2),
+			RelativeStrength:      around((def.RelativeStrengthLo + def.RelativeStrengthHi) / 2),
+			TrendStrength:         around(def.TrendStrength),
+			AvgTrendStrength:      around(def.AvgTrendStrength),
+			OrderImbalance:        around(def.OrderImbalance),
+			MarketEfficiencyRatio: around(def.MarketEfficiencyRatio),
+		}
+		if n%100 == 0 {
+			metrics.TrendStrength = math.NaN()
+		}
+		
+		EvaluateBuyGrid(&metrics, grid, out)
+		for i, predicate := range predicates {
+			want := predicate(metrics)
+			if out[i] != want {
+				t.Fatalf("snapshot %d, grid entry %d: got %v, want %v (%+v)", n, i, out[i], want, metrics)
+			}
+			if want {
+				buys++
+			}
+		}
+	}
+	if buys == 0 {
+		t.Fatal("no snapshot opened a trade; the test covers only the rejecting path")
+	}
+}
@@ -1,6 +1,7 @@
 package types
 
 import (
+	"sync"
 	"time"
 )
 
@@ -30,10 +31,24 @@ func NewMarketMetrics() *MarketMetrics {
 
 // TickData represents a single market tick
 type TickData struct {
+	Symbol    string // Empty for replayed data
 	Price     float64
 	Volume    float64
 	IsAsk     bool
-	Timestamp time.Time
+	Timestamp int64 // Milliseconds since epoch, as sent by the exchange
+}
+
+// HistoricalData holds a loaded dataset as parallel column arrays
+type HistoricalData struct {
+	Timestamps []int64 // Milliseconds since epoch
+	Prices     []float64
+	Volumes    []float64
+	IsAsk      []bool
+}
+
+// Len returns the number of ticks in the dataset
+func (hd *HistoricalData) Len() int {
+	return len(hd.Prices)
 }
 
 // TradeData represents an active trade
@@ -42,6 +57,7 @@ type TradeData struct {
 	Direction    string
 	EntryPrice   float64
 	EntryTime    time.Time
+	TimeExitAt   time.Time
 	HighestPrice float64
 	LowestPrice  float64
 	StopLoss     float64
@@ -55,41 +71,153 @@ func NewTradeData() *TradeData {
 	}
 }
 
+// TradeRecord represents a completed trade
+type TradeRecord struct {
+	EntryTime  time.Time
+	ExitTime   time.Time
+	EntryPrice float64
+	ExitPrice  float64
+	PnL        float64 // Percent
+	Reason     ExitReason
+}
+
+// ExitReason identifies the condition that closed a trade. Exit checks and
+// comparisons work on the integer; the name is only produced for output.
+type ExitReason int
+
+// Exit reasons
+const (
+	ExitNone ExitReason = iota
+	ExitStopLoss
+	ExitTakeProfit
+	ExitTimeLimit
+	ExitTrendReversal
+)
+
+// exitReasonNames holds the name of each exit reason, as logged and journaled
+var exitReasonNames = [...]string{
+	ExitNone:          "",
+	ExitStopLoss:      "stop_loss",
+	ExitTakeProfit:    "take_profit",
+	ExitTimeLimit:     "time_exit",
+	ExitTrendReversal: "trend_reversal",
+}
+
+// String returns the exit reason name
+func (r ExitReason) String() string {
+	if r < 0 || int(r) >= len(exitReasonNames) {
+		return "unknown"
+	}
+	return exitReasonNames[r]
+}
+
+// ParseExitReason returns the exit reason with the given name
+func ParseExitReason(name string) (ExitReason, bool) {
+	for r, n := range exitReasonNames {
+		if n == name {
+			return ExitReason(r), true
+		}
+	}
+	return ExitNone, false
+}
+
+// SignalAction identifies what a signal asks for. It is an integer so
+// dispatch on it compares machine words rather than strings.
+type SignalAction int
+
+// Signal actions
+const (
+	ActionBuy SignalAction = iota + 1
+	ActionSell
+	ActionClose
+)
+
+// String returns the action name used in logs
+func (a SignalAction) String() string {
+	switch a {
+	case ActionBuy:
+		return "BUY"
+	case ActionSell:
+		return "SELL"
+	case ActionClose:
+		return "CLOSE"
+	default:
+		return "UNKNOWN"
+	}
+}
+
+// Trade sides
+const (
+	SideBuy = "buy"
+)
+
 // Signal represents a trading signal
 type Signal struct {
-	Action          string
+	Action          SignalAction
 	Side            string
 	Price           float64
 	Time            time.Time
-	Reason          string
+	Reason          ExitReason
 	ProfitPercent   float64
 	UpdatedStopLoss float64
-	Metrics         *MarketMetrics
+	EntryPrice      float64   // Close signals: entry of the trade being closed
+	EntryTime       time.Time // Close signals: entry of the trade being closed
+	Metrics         *MarketMetrics // Snapshot owned by the signal
+	
+	metrics MarketMetrics // Storage for Metrics, so a signal is one allocation
 }
 
-// NewBuySignal creates a new buy signal
-func NewBuySignal(price float64, timestamp time.Time, metrics *MarketMetrics) *Signal {
-	return &Signal{
-		Action:  "BUY",
-		Side:    "buy",
-		Price:   price,
-		Time:    timestamp,
-		Metrics: metrics,
-	}
+// signalPool recycles signals released by their consumer
+var signalPool = sync.Pool{
+	New: func() interface{} {
+		return new(Signal)
+	},
+}
+
+// acquireSignal returns a cleared signal from the pool
+func acquireSignal() *Signal {
+	signal := signalPool.Get().(*Signal)
+	*signal = Signal{}
+	return signal
 }
 
-// NewSellSignal creates a new sell signal
-func NewSellSignal(price float64, timestamp time.Time, reason string, profitPercent float64, stopLoss float64) *Signal {
-	return &Signal{
-		Action:          "CLOSE",
-		Price:           price,
-		Time:            timestamp,
-		Reason:          reason,
-		ProfitPercent:   profitPercent,
-		UpdatedStopLoss: stopLoss,
+// ReleaseSignal returns a signal to the pool once its consumer is done with
+// it. Neither the signal nor its Metrics may be used afterwards.
+func ReleaseSignal(signal *Signal) {
+	if signal != nil {
+		signalPool.Put(signal)
 	}
 }
 
+// NewBuySignal creates a new buy signal.
+// The signal takes its own copy of the metrics, so callers can pass a
+// pointer to a per-tick value without it escaping to the heap. Any
+// rounding for display is left to whoever renders the signal.
+func NewBuySignal(price float64, timestamp time.Time, metrics *MarketMetrics) *Signal {
+	signal := acquireSignal()
+	signal.Action = ActionBuy
+	signal.Side = SideBuy
+	signal.Price = price
+	signal.Time = timestamp
+	signal.metrics = *metrics
+	signal.Metrics = &signal.metrics
+	return signal
+}
+
+// NewSellSignal creates a new sell signal closing the given trade
+func NewSellSignal(price float64, timestamp time.Time, reason ExitReason, profitPercent float64, stopLoss float64, trade *TradeData) *Signal {
+	signal := acquireSignal()
+	signal.Action = ActionClose
+	signal.Price = price
+	signal.Time = timestamp
+	signal.Reason = reason
+	signal.ProfitPercent = profitPercent
+	signal.UpdatedStopLoss = stopLoss
+	signal.EntryPrice = trade.EntryPrice
+	signal.EntryTime = trade.EntryTime
+	return signal
+}
+
 // MarketState represents the current state of the market
 type MarketState struct {
 	Timestamp    time.Time
@@ -107,6 +235,10 @@ type PerformanceMetrics struct {
 	WinRate      float64
 	AveragePnL   float64
 	TotalPnL     float64
+	GrossProfit  float64 // Sum of winning trades' PnL
+	GrossLoss    float64 // Sum of losing trades' PnL, as a positive number
+	BestTrade    float64
+	WorstTrade   float64
 	MaxDrawdown  float64
 }
 
@@ -119,6 +251,10 @@ func NewPerformanceMetrics() *PerformanceMetrics {
 		WinRate:      0.0,
 		AveragePnL:   0.0,
 		TotalPnL:     0.0,
+		GrossProfit:  0.0,
+		GrossLoss:    0.0,
+		BestTrade:    0.0,
+		WorstTrade:   0.0,
 		MaxDrawdown:  0.0,
 	}
 }
\ No newline at end of file